@@ -21,6 +21,14 @@ def page_not_found(e):
     return jsonify(error="Not found"), 404
 
 
+@app.after_request
+def count_statements(response):
+    """reports the number of SQL statements the request ran"""
+    if hasattr(storage, "statements"):
+        response.headers["X-Statement-Count"] = storage.statements()
+    return response
+
+
 @app.teardown_appcontext
 def teardown_db(exception):
     """closes the storage on teardown"""
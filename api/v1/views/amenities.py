@@ -5,6 +5,7 @@ view for Amenity objects that handles all default RestFul API actions
 from flask import jsonify, abort, request
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.pages import paginate
 from models.amenity import Amenity
 
 
@@ -13,8 +14,7 @@ def handle_amenities():
     """Retrieves the list of all Amenity objects or
     create a new Amenity object"""
     if request.method == 'GET':
-        return jsonify([obj.to_dict() for obj in storage.all("Amenity").
-                        values()]), 200
+        return paginate(storage.query(Amenity))
     if request.method == 'POST':
             if not request.get_json(silent=True):
                 abort(400, "Not a JSON")
@@ -5,6 +5,7 @@ view for City objects that handles all default RestFul API actions
 from flask import jsonify, abort, request
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.pages import paginate
 from models.city import City
 
 
@@ -15,8 +16,7 @@ def handle_cities(state_id):
     state_obj = storage.get("State", state_id)
     if state_obj:
         if request.method == 'GET':
-            return jsonify([city_obj.to_dict() for city_obj in state_obj.
-                            cities]), 200
+            return paginate(storage.query(City).filter(state_id=state_id))
         if request.method == 'POST':
             if not request.get_json(silent=True):
                 abort(400, "Not a JSON")
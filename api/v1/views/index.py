@@ -2,7 +2,7 @@
 """
 starts a Flask web application
 """
-from flask import jsonify
+from flask import abort, jsonify
 from models import storage
 from api.v1.views import app_views
 
@@ -19,5 +19,14 @@ def stats():
     """display the number of each objects by type"""
     all_classes = {"Amenity": "amenities", "City": "cities", "Place": "places",
                    "Review": "reviews", "State": "states", "User": "users"}
-    return jsonify({v: storage.count(k) for k, v in all_classes.items()
-                    if storage.count(k)})
+    counts = storage.counts()
+    return jsonify({v: counts[k] for k, v in all_classes.items()
+                    if counts.get(k)})
+
+
+@app_views.route('/status/pool', strict_slashes=False)
+def pool_status():
+    """display the size and usage of the database connection pool"""
+    if not hasattr(storage, "pool_stats"):
+        abort(404)
+    return jsonify(storage.pool_stats())
@@ -0,0 +1,30 @@
+#!/usr/bin/python3
+"""
+lists the objects of a query for the list endpoints, a page at a time if the
+request has a limit or after argument
+"""
+from flask import abort, jsonify, request, url_for
+
+# integer - the most objects a page holds
+max_limit = 1000
+
+
+def paginate(query, order_by="created_at"):
+    """returns the response listing the objects of query, or the page of
+    them the limit and after arguments of the request ask for, with a Link
+    header to the next page"""
+    limit = request.args.get('limit')
+    after = request.args.get('after')
+    if limit is None and after is None:
+        return jsonify([obj.to_dict() for obj in query]), 200
+    try:
+        limit = min(int(limit or max_limit), max_limit)
+        objs, cursor = query.order_by(order_by).page(limit, after)
+    except ValueError:
+        abort(400, "Invalid limit or after")
+    response = jsonify([obj.to_dict() for obj in objs])
+    if cursor:
+        args = dict(request.view_args, limit=limit, after=cursor)
+        response.headers['Link'] = '<{}>; rel="next"'.format(
+            url_for(request.endpoint, **args))
+    return response, 200
@@ -10,6 +10,8 @@ amenities: list of Amenity ids
 from flask import jsonify, abort, request
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.pages import paginate
+from models.city import City
 from models.place import Place
 
 
@@ -20,8 +22,7 @@ def handle_places(city_id):
     city_obj = storage.get("City", city_id)
     if city_obj:
         if request.method == 'GET':
-            return jsonify([place_obj.
-                            to_dict() for place_obj in city_obj.places]), 200
+            return paginate(storage.query(Place).filter(city_id=city_id))
         if request.method == 'POST':
             if not request.get_json(silent=True):
                 abort(400, "Not a JSON")
@@ -67,3 +68,41 @@ def place_byid(place_id):
             return jsonify(place_obj.to_dict()), 200
     else:
         abort(404)
+
+
+@app_views.route('/places_search', methods=['POST'], strict_slashes=False)
+def places_search():
+    """Retrieves the Place objects in the states and cities listed in the
+    request body that have all the amenities listed"""
+    kwargs = request.get_json(silent=True)
+    if not isinstance(kwargs, dict):
+        abort(400, "Not a JSON")
+    for key in ['states', 'cities', 'amenities']:
+        ids = kwargs.get(key) or []
+        if not isinstance(ids, list) or \
+           not all(isinstance(id, str) for id in ids):
+            abort(400, "Not a list")
+    state_ids = kwargs.get('states') or []
+    city_ids = kwargs.get('cities') or []
+    amenity_ids = kwargs.get('amenities') or []
+    if state_ids:
+        city_ids = city_ids + [city_obj.id for city_obj in storage.
+                               query(City).filter(state_id__in=state_ids)]
+    if city_ids:
+        places = storage.query(Place).filter(city_id__in=city_ids).all()
+    elif amenity_ids:
+        # only the places of one of the amenities can have them all
+        amenity_obj = storage.get("Amenity", amenity_ids[0])
+        places = amenity_obj.place_amenities if amenity_obj else []
+    else:
+        places = storage.all(Place).values()
+    results = []
+    for place_obj in places:
+        if amenity_ids:
+            ids = [amenity_obj.id for amenity_obj in place_obj.amenities]
+            if not all(amenity_id in ids for amenity_id in amenity_ids):
+                continue
+        place_dict = place_obj.to_dict()
+        place_dict.pop('amenities', None)
+        results.append(place_dict)
+    return jsonify(results), 200
@@ -19,7 +19,7 @@ def handle_places_amenities(place_id, amenity_id=None):
     Retrieves the list of all Amenity objects of a Place,
     delete or create an Amenity object of a Place
     """
-    place_obj = storage.get("Place", place_id)
+    place_obj = storage.get("Place", place_id, load={"amenities": "selectin"})
     if place_obj:
         if request.method == 'GET' and amenity_id is None:
             return jsonify([amenity_obj.to_dict() for amenity_obj in place_obj.
@@ -30,7 +30,7 @@ def handle_places_amenities(place_id, amenity_id=None):
             if request.method == 'DELETE':
                 if amenity_id not in amenity_ids:
                     abort(404)
-                place_obj.amenities.remove(amenity_obj)
+                storage.unlink(place_obj, amenity_obj)
                 storage.save()
                 return {}, 200
             if request.method == 'POST':
@@ -40,7 +40,7 @@ def handle_places_amenities(place_id, amenity_id=None):
                 # if kwargs:
                 #     for k, v in kwargs.items():
                 #         setattr(amenity_obj, k, v)
-                place_obj.amenities.append(amenity_obj)
+                storage.link(place_obj, amenity_obj)
                 place_obj.save()
                 return jsonify(amenity_obj.to_dict()), 201
         else:
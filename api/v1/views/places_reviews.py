@@ -5,6 +5,7 @@ view for Review objects that handles all default RestFul API actions
 from flask import jsonify, abort, request
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.pages import paginate
 from models.review import Review
 
 
@@ -16,8 +17,7 @@ def handle_reviews(place_id):
     place_obj = storage.get("Place", place_id)
     if place_obj:
         if request.method == 'GET':
-            return jsonify([review_obj.to_dict() for review_obj in place_obj.
-                            reviews]), 200
+            return paginate(storage.query(Review).filter(place_id=place_id))
         if request.method == 'POST':
             if not request.get_json(silent=True):
                 abort(400, "Not a JSON")
@@ -5,6 +5,7 @@ view for State objects that handles all default RestFul API actions
 from flask import jsonify, abort, request
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.pages import paginate
 from models.state import State
 
 
@@ -12,8 +13,7 @@ from models.state import State
 def handle_states():
     """Retrieves the list of all State objects or create a new State object"""
     if request.method == 'GET':
-        return jsonify([obj.to_dict() for obj in storage.all("State").
-                        values()]), 200
+        return paginate(storage.query(State))
     if request.method == 'POST':
             if not request.get_json(silent=True):
                 abort(400, "Not a JSON")
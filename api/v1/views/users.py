@@ -5,6 +5,7 @@ view for User objects that handles all default RestFul API actions
 from flask import jsonify, abort, request
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.pages import paginate
 from models.user import User
 
 
@@ -12,8 +13,7 @@ from models.user import User
 def handle_users():
     """Retrieves the list of all User objects or create a new User object"""
     if request.method == 'GET':
-        return jsonify([obj.to_dict() for obj in storage.all("User").
-                        values()]), 200
+        return paginate(storage.query(User))
     if request.method == 'POST':
             if not request.get_json(silent=True):
                 abort(400, "Not a JSON")
@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+"""
+Benchmark creating objects one save() at a time and in a transaction
+
+Usage: python3 -m benchmarks.bulk_create [objects]
+
+Each storage engine runs in its own process in a scratch directory, as the
+models only map their columns when imported for a database.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+engines = {"file": {"HBNB_TYPE_STORAGE": "file"},
+           "journal": {"HBNB_TYPE_STORAGE": "file", "HBNB_FILE_JOURNAL": "1"},
+           "sqlite": {"HBNB_TYPE_STORAGE": "sqlite",
+                      "HBNB_SQLITE_PATH": "bulk.db"}}
+
+
+def create(count):
+    """saves count new states one save() each, then count more in a single
+    transaction, and prints how long each took"""
+    import models
+    from models.state import State
+    start = time.perf_counter()
+    for i in range(count):
+        State(name="S{}".format(i)).save()
+    each = time.perf_counter() - start
+    start = time.perf_counter()
+    with models.storage.transaction():
+        for i in range(count):
+            State(name="T{}".format(i)).save()
+    once = time.perf_counter() - start
+    print("{:>8}: {} states, save() each {:7.3f} s, transaction {:7.3f} s "
+          "({:.0f}x)".format(sys.argv[2], count, each, once, each / once))
+
+
+def run(count=2000):
+    """runs create(count) against every engine"""
+    for name, env in engines.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            subprocess.run([sys.executable, "-m", "benchmarks.bulk_create",
+                            "--engine", name, str(count)], check=True,
+                           cwd=tmp, env=dict(os.environ, **env,
+                                             PYTHONPATH=os.getcwd()))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--engine":
+        create(int(sys.argv[3]))
+    else:
+        run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
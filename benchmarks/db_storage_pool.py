@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+Load test the DBStorage connection pool against an SQLite stand-in
+
+Usage: python3 -m benchmarks.db_storage_pool [threads] [requests]
+
+Each simulated request looks a state up then holds its connection for a
+couple of milliseconds, as a view serializing a response would, before
+closing the session. The same burst runs against SQLAlchemy's default
+pool and one sized with HBNB_POOL_SIZE for the number of threads.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+
+def burst(storage, state, threads, requests):
+    """returns the latency in seconds of every request of the burst"""
+    latencies = []
+
+    def client():
+        for _ in range(requests):
+            start = time.perf_counter()
+            storage.get(state.__class__, state.id)
+            time.sleep(0.002)
+            storage.close()
+            latencies.append(time.perf_counter() - start)
+    workers = [threading.Thread(target=client) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sorted(latencies)
+
+
+def run(threads=32, requests=50):
+    """compares the default and a tuned pool on the same burst"""
+    # the models only map their columns when imported for a database
+    os.environ["HBNB_TYPE_STORAGE"] = "sqlite"
+    os.environ.setdefault("HBNB_SQLITE_PATH",
+                          os.path.join(tempfile.mkdtemp(), "pool.db"))
+    import models
+    from models.engine.sqlite_storage import SQLiteStorage
+    from models.state import State
+    state = State(name="California")
+    models.storage.new(state)
+    models.storage.save()
+    models.storage.close()
+    configs = [("default", {}),
+               ("tuned", {"HBNB_POOL_SIZE": str(threads),
+                          "HBNB_POOL_MAX_OVERFLOW": "0"})]
+    for name, env in configs:
+        with mock.patch.dict(os.environ, env):
+            storage = SQLiteStorage()
+        storage.reload()
+        latencies = burst(storage, state, threads, requests)
+        stats = storage.pool_stats()
+
+        def percentile(p):
+            return latencies[int(p / 100 * (len(latencies) - 1))] * 1000
+        print("{:>8}: p50 {:6.2f} ms  p95 {:6.2f} ms  p99 {:6.2f} ms  "
+              "max {:6.2f} ms | pool {:2} + {:2}, peak {:2}, saturated "
+              "{:5}, wait max {:6.2f} ms".format(
+                  name, percentile(50), percentile(95), percentile(99),
+                  latencies[-1] * 1000, stats["size"], stats["max_overflow"],
+                  stats["peak_checked_out"], stats["saturated"],
+                  stats["wait_max_ms"]))
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:3]])
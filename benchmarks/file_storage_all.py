@@ -0,0 +1,34 @@
+#!/usr/bin/python3
+"""
+Benchmark FileStorage.all(cls) while the number of unrelated objects grows
+
+Usage: python3 -m benchmarks.file_storage_all [max_reviews]
+"""
+
+import sys
+from timeit import timeit
+from models.amenity import Amenity
+from models.engine.file_storage import FileStorage
+from models.review import Review
+
+
+def run(max_reviews=1000000, amenities=100, repeat=1000):
+    """times all("Amenity") with 10, 100, ... up to max_reviews Reviews"""
+    storage = FileStorage()
+    FileStorage._FileStorage__objects = {}
+    for _ in range(amenities):
+        storage.new(Amenity(name="Wifi"))
+    reviews = 0
+    size = 10
+    while size <= max_reviews:
+        while reviews < size:
+            storage.new(Review(text="Great"))
+            reviews += 1
+        usec = timeit(lambda: storage.all("Amenity"), number=repeat)
+        print("{:>8} reviews: all(\"Amenity\") {:8.2f} usec".format(
+            reviews, usec / repeat * 1e6))
+        size *= 10
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""
+Benchmark FileStorage.save and reload in the JSON and the binary formats
+
+Usage: python3 -m benchmarks.file_storage_formats [objects]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from models.engine import file_storage, serializers
+from models.place import Place
+from models.review import Review
+from models.state import State
+
+FileStorage = file_storage.FileStorage
+
+
+def run(count=100000):
+    """times save and reload of count objects in each format"""
+    objects = {}
+    for i in range(count):
+        if i % 3 == 0:
+            obj = State(name="State {}".format(i))
+        elif i % 3 == 1:
+            obj = Place(name="Place {}".format(i), number_rooms=3,
+                        latitude=37.77, longitude=-122.41)
+        else:
+            obj = Review(text="Review {}".format(i), place_id="x")
+        objects[obj.__class__.__name__ + "." + obj.id] = obj
+    storage = FileStorage()
+    with tempfile.TemporaryDirectory() as directory:
+        for name, serializer in serializers.serializers.items():
+            path = os.path.join(directory, serializer.path)
+            FileStorage._FileStorage__file_path = path
+            FileStorage._FileStorage__serializer = serializer
+            FileStorage._FileStorage__objects = dict(objects)
+            start = time.perf_counter()
+            storage.save()
+            saved = time.perf_counter() - start
+            FileStorage._FileStorage__objects = {}
+            start = time.perf_counter()
+            storage.reload()
+            loaded = time.perf_counter() - start
+            print("{:>6}: {:8.0f} KB, save {:9.0f} objects/s, "
+                  "reload {:9.0f} objects/s".format(
+                      name, os.path.getsize(path) / 1024, count / saved,
+                      storage.count() / loaded))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""
+Benchmark the peak memory of FileStorage.reload on a generated snapshot
+
+Usage: python3 -m benchmarks.file_storage_reload [size_in_MB]
+
+Each loader runs in its own process so that its peak resident set size
+can be told apart from the other's.
+"""
+
+import json
+from multiprocessing import Process, Queue
+import os
+import resource
+import sys
+import tempfile
+import time
+import uuid
+from models.engine import file_storage
+
+FileStorage = file_storage.FileStorage
+
+
+def generate(name, size):
+    """writes a snapshot of Review records of about size bytes to name"""
+    template = ('"Review.{0}": {{"id": "{0}", "__class__": "Review", '
+                '"created_at": "2020-01-27T22:47:10.147897", '
+                '"updated_at": "2020-01-27T22:47:54.365546", '
+                '"place_id": "{1}", "user_id": "{1}", '
+                '"text": "Great place, would stay again"}}')
+    count = 0
+    with open(name, "w") as f:
+        f.write("{")
+        while f.tell() < size:
+            batch = [template.format(uuid.uuid4(), uuid.uuid4())
+                     for _ in range(1000)]
+            f.write((", " if count else "") + ", ".join(batch))
+            count += len(batch)
+        f.write("}")
+    return count
+
+
+def load_whole(name):
+    """the former reload: json.load the file, then build every object"""
+    with open(name) as f:
+        jo = json.load(f)
+    objects = {}
+    for key in jo:
+        objects[key] = file_storage.classes[jo[key]["__class__"]](**jo[key])
+    return len(objects)
+
+
+def load_streaming(name):
+    """FileStorage.reload, which builds the objects one record at a time"""
+    FileStorage._FileStorage__file_path = name
+    FileStorage._FileStorage__objects = {}
+    storage = FileStorage()
+    storage.reload()
+    return storage.count()
+
+
+def measure(loader, name, queue):
+    """runs loader in this process and reports its time and peak memory"""
+    start = time.perf_counter()
+    count = loader(name)
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((count, seconds, peak))
+
+
+def run(size_mb=256):
+    """compares both loaders on a snapshot of size_mb megabytes"""
+    with tempfile.TemporaryDirectory() as directory:
+        name = os.path.join(directory, "file.json")
+        count = generate(name, size_mb << 20)
+        print("{} records, {:.0f} MB".format(
+            count, os.path.getsize(name) / (1 << 20)))
+        for loader in [load_whole, load_streaming]:
+            queue = Queue()
+            process = Process(target=measure, args=(loader, name, queue))
+            process.start()
+            loaded, seconds, peak = queue.get()
+            process.join()
+            print("{:>15}: {} objects in {:6.2f} s, peak RSS {:7.0f} MB"
+                  .format(loader.__name__, loaded, seconds, peak / 1024))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 256)
@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""
+Benchmark building each model class from to_dict() records and serializing
+it back
+
+Usage: python3 -m benchmarks.model_classes [objects]
+
+The objects are serialized once each, so to_dict() builds every dictionary
+instead of reusing one. The garbage collector is paused while timing, as
+timeit does.
+"""
+
+import gc
+import sys
+import time
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+records = {State: {"name": "California"},
+           City: {"name": "San Francisco", "state_id": "s"},
+           Amenity: {"name": "Wifi"},
+           User: {"email": "a@b.c", "password": "pwd", "first_name": "Ann",
+                  "last_name": "Lee"},
+           Place: {"city_id": "c", "user_id": "u", "name": "Loft",
+                   "description": "Bright", "number_rooms": 2,
+                   "number_bathrooms": 1, "max_guest": 4,
+                   "price_by_night": 120, "latitude": 37.77,
+                   "longitude": -122.41},
+           Review: {"place_id": "p", "user_id": "u", "text": "Great"}}
+
+
+def run(count=100000):
+    """times building and serializing count objects of each class"""
+    for cls, fields in records.items():
+        record = cls(**fields).to_dict()
+        gc.disable()
+        start = time.perf_counter()
+        objs = [cls(**record) for _ in range(count)]
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        for obj in objs:
+            obj.to_dict()
+        dump = time.perf_counter() - start
+        gc.enable()
+        print("{:>8}: {:8.0f} built/s, {:8.0f} to_dict()/s".format(
+            cls.__name__, count / build, count / dump))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
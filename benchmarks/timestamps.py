@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+"""
+Benchmark building objects from to_dict() records and calling to_dict()
+
+Usage: python3 -m benchmarks.timestamps [objects]
+
+Both run once with the strptime()/strftime() codec BaseModel used before
+and once with parse_time()/format_time().
+"""
+
+from datetime import datetime
+import sys
+import time
+from unittest import mock
+from models import base_model
+from models.review import Review
+
+
+def strptime(string):
+    """the former parsing of a timestamp"""
+    return datetime.strptime(string, base_model.time)
+
+
+def strftime(value):
+    """the former formatting of a timestamp"""
+    return value.strftime(base_model.time)
+
+
+def timed(function, records):
+    """returns the seconds function takes over every record"""
+    start = time.perf_counter()
+    for record in records:
+        function(record)
+    return time.perf_counter() - start
+
+
+def run(count=1000000):
+    """times hydrating and serializing count reviews with both codecs"""
+    record = Review(text="Great", place_id="p", user_id="u").to_dict()
+    records = [record] * count
+    objs = [Review(**record) for record in records[:1000]] * (count // 1000)
+    codecs = [("strptime/strftime", strptime, strftime),
+              ("fromisoformat/isoformat", base_model.parse_time,
+               base_model.format_time)]
+    for name, parse, format in codecs:
+        with mock.patch.object(base_model, "parse_time", parse), \
+             mock.patch.object(base_model, "format_time", format):
+            build = timed(lambda fields: Review(**fields), records)
+            dump = timed(lambda obj: obj.to_dict(), objs)
+        print("{:>23}: {} objects built in {:6.2f} s, {} to_dict() in "
+              "{:6.2f} s".format(name, len(records), build, len(objs), dump))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
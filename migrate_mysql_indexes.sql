@@ -0,0 +1,14 @@
+-- adds the indexes the models declare to a database created before them
+-- the same as calling migrate() on a DBStorage, which skips the ones found
+
+USE hbnb_dev_db;
+CREATE INDEX ix_amenities_created_at ON amenities (created_at, id);
+CREATE INDEX ix_states_created_at ON states (created_at, id);
+CREATE INDEX ix_users_created_at ON users (created_at, id);
+CREATE INDEX ix_users_email ON users (email);
+CREATE INDEX ix_cities_state_id_created_at ON cities (state_id, created_at, id);
+CREATE INDEX ix_places_city_id_created_at ON places (city_id, created_at, id);
+CREATE INDEX ix_places_user_id ON places (user_id);
+CREATE INDEX ix_place_amenity_amenity_id ON place_amenity (amenity_id);
+CREATE INDEX ix_reviews_place_id_created_at ON reviews (place_id, created_at, id);
+CREATE INDEX ix_reviews_user_id ON reviews (user_id);
@@ -4,7 +4,7 @@ import models
 from models.base_model import BaseModel, Base
 from os import getenv
 import sqlalchemy
-from sqlalchemy import Column, String
+from sqlalchemy import Column, String, Index
 from sqlalchemy.orm import relationship
 
 
@@ -12,6 +12,8 @@ class Amenity(BaseModel, Base):
     """Representation of Amenity """
     if models.storage_t == 'db':
         __tablename__ = 'amenities'
+        __table_args__ = (Index('ix_amenities_created_at', 'created_at',
+                                'id'),)
         name = Column(String(128), nullable=False)
     else:
         name = ""
@@ -19,3 +21,10 @@ class Amenity(BaseModel, Base):
     def __init__(self, *args, **kwargs):
         """initializes Amenity"""
         super().__init__(*args, **kwargs)
+
+    if models.storage_t != 'db':
+        @property
+        def place_amenities(self):
+            """getter for list of place instances having the amenity"""
+            from models.place import Place
+            return models.storage.referrers(Place, "amenity_ids", self.id)
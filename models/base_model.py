@@ -12,6 +12,69 @@ from sqlalchemy.ext.declarative import declarative_base
 import uuid
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
+# the value recorded for an attribute the object did not have before
+missing = object()
+
+
+def parse_time(string):
+    """returns the datetime string holds in the time format"""
+    # fromisoformat() reads this layout several times faster than strptime()
+    if len(string) == 26 and string[10] == "T" and string[19] == "." and \
+       string[20:].isdigit():
+        return datetime.fromisoformat(string)
+    return datetime.strptime(string, time)
+
+
+def format_time(value):
+    """returns the datetime value as a string in the time format"""
+    # isoformat() writes the same string several times faster than
+    # strftime(), except for aware datetimes and years before 1000
+    if value.tzinfo is None and value.year >= 1000:
+        if value.microsecond:
+            return value.isoformat()
+        return value.isoformat() + ".000000"
+    return value.strftime(time)
+
+
+def coerce(kind, value):
+    """returns value converted to kind, int or float, or as it is if it
+    cannot be"""
+    if value is None or type(value) is kind:
+        return value
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        return value
+
+
+# dictionary - the layout of each model class, by class
+layouts = {}
+
+
+def layout(cls):
+    """returns the kind of each numeric attribute of class cls by name and
+    the attributes to_dict() leaves out, worked out once per class"""
+    if cls in layouts:
+        return layouts[cls]
+    kinds = {}
+    if models.storage_t == "db":
+        mapper = sqlalchemy.inspect(cls, raiseerr=False)
+        for column in mapper.columns if mapper else ():
+            try:
+                kind = column.type.python_type
+            except NotImplementedError:
+                continue
+            if kind in (int, float):
+                kinds[column.key] = kind
+        hidden = ("_sa_instance_state", "password")
+    else:
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if type(value) in (int, float) and name[0] != "_":
+                    kinds[name] = type(value)
+        hidden = ()
+    layouts[cls] = kinds, hidden
+    return layouts[cls]
 
 if models.storage_t == "db":
     Base = declarative_base()
@@ -21,6 +84,15 @@ else:
 
 class BaseModel:
     """The BaseModel class from which future classes will be derived"""
+    # the attributes set since the object was loaded or last saved, with
+    # the value each had before, and the dictionary to_dict() last built,
+    # kept out of __dict__ so they are never serialized
+    __slots__ = ("_BaseModel__changed", "_BaseModel__dict", "__dict__",
+                 "__weakref__")
+    # tuple - the attributes the __setattr__ of a class transforms, the
+    # constructor assigns them through it
+    transformed = ()
+
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
         created_at = Column(DateTime, default=datetime.utcnow)
@@ -29,49 +101,177 @@ class BaseModel:
     def __init__(self, *args, **kwargs):
         """Initialization of the base model"""
         if kwargs:
+            kinds = layout(self.__class__)[0]
+            fields = {}
             for key, value in kwargs.items():
-                if key != "__class__":
-                    setattr(self, key, value)
-            if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
-            else:
-                self.created_at = datetime.utcnow()
-            if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
-            else:
-                self.updated_at = datetime.utcnow()
-            if kwargs.get("id", None) is None:
-                self.id = str(uuid.uuid4())
+                if key in kinds:
+                    fields[key] = coerce(kinds[key], value)
+                elif key != "__class__":
+                    fields[key] = value
+            for key in ["created_at", "updated_at"]:
+                value = fields.get(key)
+                if value and type(value) is str:
+                    fields[key] = parse_time(value)
+                elif not isinstance(value, datetime):
+                    fields[key] = datetime.utcnow()
+            if fields.get("id") is None:
+                fields["id"] = str(uuid.uuid4())
+            self.__assign(fields)
         else:
             self.id = str(uuid.uuid4())
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
 
+    if models.storage_t == "db":
+        def __assign(self, fields):
+            """sets the attributes of a new object to fields"""
+            for key, value in fields.items():
+                setattr(self, key, value)
+
+        def __setattr__(self, name, value):
+            """sets an attribute, dropping the dictionary to_dict() built"""
+            if name in self.__slots__ or name.startswith("_sa_"):
+                return super().__setattr__(name, value)
+            super().__setattr__("_BaseModel__dict", None)
+            old = self.__dict__.get(name, missing)
+            super().__setattr__(name, value)
+            if old is missing or old != value:
+                self.__record(name, old)
+    else:
+        def __assign(self, fields):
+            """sets the attributes of a new object to fields"""
+            # the storage only indexes the ids held by objects it stores,
+            # which this one is not yet, so __setattr__ is only needed for
+            # the attributes it transforms
+            transformed = {key: fields.pop(key) for key in self.transformed
+                           if key in fields}
+            self.__dict__.update(fields)
+            super().__setattr__("_BaseModel__changed",
+                                dict.fromkeys(fields, missing))
+            for key, value in transformed.items():
+                setattr(self, key, value)
+
+        def __setattr__(self, name, value):
+            """sets an attribute, letting the storage follow the ids of
+            other objects it holds"""
+            if name in self.__slots__:
+                return super().__setattr__(name, value)
+            super().__setattr__("_BaseModel__dict", None)
+            old = self.__dict__.get(name, missing)
+            super().__setattr__(name, value)
+            if old is missing or old != value:
+                self.__record(name, old)
+            if name.endswith("_id") or name.endswith("_ids"):
+                models.storage.reindex(self, name,
+                                       None if old is missing else old)
+
+    def __record(self, name, old):
+        """adds name to the attributes changed since the last save, with old
+        its value before the first change"""
+        try:
+            self.__changed.setdefault(name, old)
+        except AttributeError:
+            super().__setattr__("_BaseModel__changed", {name: old})
+
     def __str__(self):
         """String representation of the BaseModel class"""
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
                                          self.__dict__)
 
+    def changed(self):
+        """returns the names of the attributes set to a new value since the
+        object was loaded or last saved, all of them if it never was"""
+        changed = set(getattr(self, "_BaseModel__changed", ()))
+        if models.storage_t != "db":
+            return changed
+        # a flush empties the attribute history, but not the names recorded
+        # by __setattr__, the history adds the collections changed in place
+        state = sqlalchemy.inspect(self, raiseerr=False)
+        if state is None or not state.has_identity:
+            return changed | {name for name in self.__dict__
+                              if name[0] != "_"}
+        return changed | {attr.key for attr in state.attrs
+                          if attr.history.has_changes()}
+
+    def mark_saved(self):
+        """forgets the attributes changed so far, the storage calls it once
+        they are on disk"""
+        super().__setattr__("_BaseModel__changed", {})
+
+    def snapshot(self):
+        """returns a copy of the attributes as they were when the object was
+        loaded or last saved, None if it never was"""
+        changed = getattr(self, "_BaseModel__changed", {})
+        if "id" in changed:
+            return None
+        attributes = self.__dict__.copy()
+        for name, old in changed.items():
+            if old is missing:
+                attributes.pop(name, None)
+            else:
+                attributes[name] = old
+        return attributes
+
+    def restore(self, attributes):
+        """sets the attributes back to those snapshot() returned, leaving
+        them all to be saved"""
+        self.__dict__.clear()
+        self.__dict__.update(attributes)
+        super().__setattr__("_BaseModel__changed",
+                            dict.fromkeys(attributes, missing))
+        super().__setattr__("_BaseModel__dict", None)
+
+    def rebase(self, other):
+        """takes the attributes of other, the same object as stored, that
+        did not change here since the last save"""
+        changed = self.changed()
+        for name, value in other.__dict__.items():
+            if name not in changed:
+                self.__dict__[name] = value
+        super().__setattr__("_BaseModel__dict", None)
+
     def save(self):
-        """updates the attribute 'updated_at' with the current datetime"""
+        """updates the attribute 'updated_at' with the current datetime,
+        does nothing if no attribute changed"""
+        if not self.changed():
+            return
         self.updated_at = datetime.utcnow()
         models.storage.new(self)
         models.storage.save()
 
     def to_dict(self):
         """returns a dictionary containing all keys/values of the instance"""
+        cached = getattr(self, "_BaseModel__dict", None)
+        if cached is None:
+            cached = self.__to_dict()
+            super().__setattr__("_BaseModel__dict", cached)
+        return dict(cached)
+
+    def __to_dict(self):
+        """builds the dictionary to_dict() returns copies of"""
+        # the same for every class: formatting the timestamps is most of
+        # the cost, which a per-class variant would not reduce
         new_dict = self.__dict__.copy()
         if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
+            new_dict["created_at"] = format_time(new_dict["created_at"])
         if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
+            new_dict["updated_at"] = format_time(new_dict["updated_at"])
         new_dict["__class__"] = self.__class__.__name__
-        if "_sa_instance_state" in new_dict:
-            del new_dict["_sa_instance_state"]
-        if models.storage_t == 'db' and 'password' in new_dict:
-            del new_dict['password']
+        for name in layout(self.__class__)[1]:
+            new_dict.pop(name, None)
         return new_dict
 
     def delete(self):
         """delete the current instance from the storage"""
         models.storage.delete(self)
+
+
+def uncache(obj, *args):
+    """drops the dictionary to_dict() built for obj, SQLAlchemy expired or
+    refreshed its attributes"""
+    object.__setattr__(obj, "_BaseModel__dict", None)
+
+
+if models.storage_t == "db":
+    for name in ["expire", "refresh", "refresh_flush"]:
+        sqlalchemy.event.listen(BaseModel, name, uncache, propagate=True)
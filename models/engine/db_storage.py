@@ -7,87 +7,355 @@ import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
 from models.city import City
+from models.engine.pool import TimedQueuePool
+from models.engine.query import Query, operators, position
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from contextlib import contextmanager
+import itertools
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import and_, create_engine, event, func, or_, select
+from sqlalchemy.orm import Session, joinedload, scoped_session, selectinload
+from sqlalchemy.orm import sessionmaker
+import threading
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# dictionary - the ways relationships can be loaded along with their objects
+loaders = {"selectin": selectinload, "joined": joinedload}
+
+
+def options(cls, load):
+    """returns the options loading the relationships of cls listed in load
+    with the objects, load is a list of relationship names or dotted paths
+    loaded by "selectin" or a dictionary of them to a key of loaders"""
+    if not load:
+        return []
+    if not isinstance(load, dict):
+        load = dict.fromkeys(load, "selectin")
+    opts = []
+    for path, strategy in load.items():
+        opt, owner = None, cls
+        for name in path.split("."):
+            attr = getattr(owner, name)
+            if opt is None:
+                opt = loaders[strategy](attr)
+            else:
+                opt = getattr(opt, strategy + "load")(attr)
+            owner = attr.property.mapper.class_
+        opts.append(opt)
+    return opts
+
+
+class DBQuery(Query):
+    """a Query compiled to the WHERE clause of a SELECT"""
+
+    def __init__(self, cls, session):
+        """Instantiate a DBQuery run in session"""
+        super().__init__(cls)
+        self.session = session
+
+    def clauses(self):
+        """returns the conditions as clauses of a WHERE"""
+        clauses = []
+        for field, op, value in self.conditions:
+            column = getattr(self.cls, field)
+            if op == "in":
+                clauses.append(column.in_(value))
+            else:
+                clauses.append(operators[op](column, value))
+        return clauses
+
+    def select(self):
+        """returns the SELECT of the matching objects, in order"""
+        statement = select(self.cls).where(*self.clauses())
+        if self.order:
+            statement = statement.order_by(getattr(self.cls, self.order),
+                                           self.cls.id)
+        return statement
+
+    def all(self):
+        """returns the list of matching objects"""
+        return self.session.scalars(self.select()).all()
+
+    def page(self, limit, after=None):
+        """returns up to limit matching objects, the ones following the
+        cursor after if given, and the cursor of the next page, None on
+        the last page"""
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        query = self.order_by(self.order or "id")
+        column = getattr(self.cls, query.order)
+        statement = query.select()
+        if after is not None:
+            value, id = position(query.order, after)
+            # NULLs sort first, as in Query.page()
+            if value is None:
+                statement = statement.where(or_(
+                    column.is_not(None), and_(column.is_(None),
+                                              self.cls.id > id)))
+            else:
+                statement = statement.where(or_(
+                    column > value, and_(column == value, self.cls.id > id)))
+        objs = self.session.scalars(statement.limit(limit + 1)).all()
+        return self.paged(objs, query.order, limit)
+
+    def first(self):
+        """returns a matching object, None if there is none"""
+        return self.session.scalars(
+            self.select().limit(1)).first()
+
+    def count(self):
+        """returns the number of matching objects"""
+        return self.session.scalar(
+            select(func.count(self.cls.id)).where(*self.clauses()))
+
+
+class RoutingSession(Session):
+    """a Session reading from the replica engines, round-robin, until it
+    first writes, and from the engine it is bound to, the primary, after"""
+
+    def __init__(self, replicas=None, **kwargs):
+        """Instantiate a RoutingSession, replicas returning the next
+        replica engine each time it is called"""
+        super().__init__(**kwargs)
+        self.replicas = replicas
+        self.replica = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        """returns the engine to run clause on"""
+        reads = getattr(clause, "is_select", False)
+        if self._flushing or clause is not None and not reads:
+            # what this session reads next has to see what it wrote
+            self.info["wrote"] = True
+        if self.replicas is None or self.info.get("wrote") or not reads:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        if self.replica is None:
+            self.replica = self.replicas()
+        return self.replica
 
 
 class DBStorage:
     """interaacts with the MySQL database"""
     __engine = None
     __session = None
+    # list - the engines of the read replicas of the database
+    __replicas = []
+    # the number of statements each thread ran since it last called close()
+    # and how many transaction() blocks it is in
+    __local = None
 
     def __init__(self):
         """Instantiate a DBStorage object"""
-        HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
-        HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
-        HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
-        HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        self.__engine = self.connect()
+        self.__replicas = self.replicas()
+        self.__local = threading.local()
+        for engine in [self.__engine] + self.__replicas:
+            event.listen(engine, "before_cursor_execute", self.__count)
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def connect(self, host=None):
+        """returns the engine of the MySQL database on host, by default
+        HBNB_MYSQL_HOST"""
+        HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
+        HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
+        HBNB_MYSQL_HOST = host or getenv('HBNB_MYSQL_HOST')
+        HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
+        return create_engine('mysql+mysqldb://{}:{}@{}/{}'.
+                             format(HBNB_MYSQL_USER,
+                                    HBNB_MYSQL_PWD,
+                                    HBNB_MYSQL_HOST,
+                                    HBNB_MYSQL_DB),
+                             **self.pool_options())
+
+    def replicas(self):
+        """returns the engines of the read replicas on the comma separated
+        HBNB_MYSQL_REPLICA_HOSTS"""
+        HBNB_MYSQL_REPLICA_HOSTS = getenv('HBNB_MYSQL_REPLICA_HOSTS', '')
+        return [self.connect(host.strip())
+                for host in HBNB_MYSQL_REPLICA_HOSTS.split(',')
+                if host.strip()]
+
+    def pool_options(self):
+        """returns the create_engine() arguments setting up the connection
+        pool from the HBNB_POOL_* environment variables"""
+        # recycling below MySQL's 8 hour wait_timeout and pinging on checkout
+        # keep idle connections from failing the next request
+        return {"poolclass": TimedQueuePool,
+                "pool_size": int(getenv('HBNB_POOL_SIZE', 5)),
+                "max_overflow": int(getenv('HBNB_POOL_MAX_OVERFLOW', 10)),
+                "pool_timeout": float(getenv('HBNB_POOL_TIMEOUT', 30)),
+                "pool_recycle": int(getenv('HBNB_POOL_RECYCLE', 3600)),
+                "pool_pre_ping": getenv('HBNB_POOL_PRE_PING', '1') == '1'}
+
+    def pool_stats(self):
+        """returns the size and usage of the connection pool"""
+        return self.__engine.pool.stats()
+
+    def __count(self, *args):
+        """counts a statement run by the current thread"""
+        self.__local.statements = self.statements() + 1
+
+    def statements(self):
+        """returns the number of SQL statements the current thread ran since
+        it last called close()"""
+        return getattr(self.__local, "statements", 0)
+
+    def all(self, cls=None, load=None):
+        """query on the current database session, loading the relationships
+        listed in load with the objects of cls (see options())"""
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                objs = self.__session.query(classes[clss]).options(
+                    *options(classes[clss], load if cls else None)).all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
         return (new_dict)
 
+    def iter_all(self, cls=None, batch_size=1000):
+        """yields the objects of class cls, or of every class, fetching
+        batch_size rows at a time through a server-side cursor"""
+        for clss in classes:
+            if cls is None or cls is classes[clss] or cls is clss:
+                yield from self.__session.scalars(
+                    select(classes[clss]).execution_options(
+                        yield_per=batch_size))
+
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
+        self.__session.info["wrote"] = True
 
     def save(self):
-        """commit all changes of the current database session"""
+        """commit all changes of the current database session, unless in a
+        transaction() block"""
+        if not self.in_transaction():
+            self.__commit()
+
+    def __commit(self):
+        """commits the current database session, then tells the objects in
+        it that their changes are stored"""
         self.__session.commit()
+        for obj in list(self.__session.identity_map.values()):
+            obj.mark_saved()
+
+    def in_transaction(self):
+        """returns True if the current thread is in a transaction() block"""
+        return getattr(self.__local, "depth", 0) > 0
+
+    @contextmanager
+    def transaction(self):
+        """defers save() until the outermost transaction() block exits, then
+        commits once, or rolls the session back if the block raises"""
+        depth = getattr(self.__local, "depth", 0)
+        self.__local.depth = depth + 1
+        try:
+            yield self
+        except BaseException:
+            self.__local.depth = depth
+            if not depth:
+                self.__session.rollback()
+                for obj in list(self.__session.identity_map.values()):
+                    obj.mark_saved()
+            raise
+        self.__local.depth = depth
+        if not depth:
+            self.__commit()
+
+    def batch(self):
+        """same as transaction()"""
+        return self.transaction()
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
         if obj is not None:
             self.__session.delete(obj)
+            self.__session.info["wrote"] = True
 
     def reload(self):
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
-        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        replicas = None
+        if self.__replicas:
+            replicas = itertools.cycle(self.__replicas).__next__
+        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False,
+                                    class_=RoutingSession, replicas=replicas)
         Session = scoped_session(sess_factory)
         self.__session = Session
 
+    def migrate(self):
+        """creates the indexes the models declare that the tables of an
+        existing database lack, returns their names"""
+        inspector = sqlalchemy.inspect(self.__engine)
+        created = []
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = [index["name"]
+                        for index in inspector.get_indexes(table.name)]
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                if index.name not in existing:
+                    index.create(self.__engine)
+                    created.append(index.name)
+        return created
+
     def close(self):
         """call remove() method on the private session attribute"""
         self.__session.remove()
+        self.__local.statements = 0
 
-    def get(self, cls, id):
-        """method to retrieve one object based on cls and id"""
-        try:
-            return self.all(cls).get("{}.{}".format(cls, id))
-        except:
+    def get(self, cls, id, load=None):
+        """method to retrieve one object based on cls and id, loading the
+        relationships listed in load with it (see options())"""
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls not in classes.values() or id is None:
             return None
+        return self.__session.get(cls, id, options=options(cls, load))
 
     def count(self, cls=None):
         """method to count the number of objects in storage"""
         if cls:
-            try:
-                return len(self.all(cls))
-            except:
-                return None
+            if isinstance(cls, str):
+                cls = classes.get(cls)
+            if cls not in classes.values():
+                return 0
+            return self.__session.query(func.count(cls.id)).scalar()
         else:
-            return len(self.all())
+            return sum(self.counts().values())
+
+    def counts(self):
+        """returns the number of objects of each class in a single query"""
+        tallies = [select(func.count(clss.id)).scalar_subquery().label(name)
+                   for name, clss in classes.items()]
+        row = self.__session.query(*tallies).one()
+        return dict(zip(classes, row))
+
+    def query(self, cls):
+        """returns a Query on the objects of class cls"""
+        if isinstance(cls, str):
+            cls = classes[cls]
+        return DBQuery(cls, self.__session)
+
+    def page(self, cls, limit, after=None, order_by="id"):
+        """returns up to limit objects of class cls ordered by order_by, the
+        ones following the cursor after if given, and the cursor of the next
+        page, None on the last page"""
+        return self.query(cls).order_by(order_by).page(limit, after)
+
+    def link(self, place, amenity):
+        """adds amenity to the amenities of place"""
+        if amenity not in place.amenities:
+            place.amenities.append(amenity)
+
+    def unlink(self, place, amenity):
+        """removes amenity from the amenities of place"""
+        if amenity in place.amenities:
+            place.amenities.remove(amenity)
@@ -3,85 +3,774 @@
 Contains the FileStorage class
 """
 
+import bisect
+from contextlib import contextmanager
+from datetime import datetime
 import json
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
+from models.engine import serializers
+from models.engine.locks import RWLock
+from models.engine.query import Query, matches, ordering, position
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from os import getenv, path, remove, replace, stat
+from threading import Lock, local
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
 
+class FileQuery(Query):
+    """a Query answered from the objects FileStorage holds, through its
+    indexes when a condition is an id or a reference"""
+
+    def __init__(self, cls, storage, indexed, sorted):
+        """Instantiate a FileQuery on storage, indexed being the fields
+        storage finds objects by without scanning them all and sorted the
+        function listing them in order of one of the fields it keeps sorted
+        """
+        super().__init__(cls)
+        self.storage = storage
+        self.indexed = indexed
+        self.sorted = sorted
+
+    def all(self):
+        """returns the list of matching objects"""
+        objs = self.select()
+        if self.order:
+            objs.sort(key=ordering(self.order))
+        return objs
+
+    def select(self):
+        """returns the list of matching objects in no particular order"""
+        for field, op, value in self.conditions:
+            if op in ("eq", "in") and field in self.indexed:
+                break
+        else:
+            return [obj for obj in self.storage.all(self.cls).values()
+                    if matches(obj, self.conditions)]
+        objs = {}
+        for value in value if op == "in" else [value]:
+            if field == "id":
+                found = [self.storage.get(self.cls, value)]
+            else:
+                found = self.storage.referrers(self.cls, field, value)
+            for obj in found:
+                if obj is not None:
+                    objs[obj.id] = obj
+        return [obj for obj in objs.values()
+                if matches(obj, self.conditions)]
+
+    def page(self, limit, after=None):
+        """returns up to limit matching objects, the ones following the
+        cursor after if given, and the cursor of the next page, None on
+        the last page"""
+        field = self.order or "id"
+        if self.conditions or limit < 1:
+            return super().page(limit, after)
+        start = None if after is None else position(field, after)
+        objs = self.sorted(self.cls.__name__, field, start, limit + 1)
+        if objs is None:
+            return super().page(limit, after)
+        return self.paged(objs, field, limit)
+
+
 class FileStorage:
     """serializes instances to a JSON file & deserializes back to instances"""
 
+    # serializer - the format the file is written in
+    __serializer = serializers.serializers[getenv("HBNB_FILE_FORMAT", "json")]
     # string - path to the JSON file
-    __file_path = "file.json"
+    __file_path = __serializer.path
+    # boolean - __objects were read from the JSON file next to __file_path,
+    # as neither it nor its journal exists yet, the next save() writes them
+    # all to __file_path
+    __fallback = False
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects bucketed by <class name>
+    __by_class = {}
+    # the __objects dictionary __by_class was built from
+    __indexed = None
+    # tuple - the attributes holding the id, or list of ids, of other objects
+    __references = ("state_id", "city_id", "place_id", "user_id",
+                    "amenity_ids")
+    # dictionary - keys of the objects holding an id in one of __references,
+    # by (<class name>, attribute) then id
+    __referrers = {}
+    # boolean - append changes to a journal instead of rewriting the file
+    __journal = getenv("HBNB_FILE_JOURNAL") == "1"
+    # integer - journal size in bytes that triggers a compaction
+    __journal_max = int(getenv("HBNB_FILE_JOURNAL_MAX", 1 << 20))
+    # dictionaries - keys changed through new() or delete() since save()
+    __dirty = {}
+    __deleted = {}
+    # integer - how many times save() wrote them
+    __saves = 0
+    # tuple - what identified the JSON file when it was last read or written
+    __stamp = None
+    # integer - bytes of the journal already applied to __objects
+    __applied = 0
+    # boolean - keep the records read from disk until they are accessed
+    __lazy = getenv("HBNB_FILE_LAZY") == "1"
+    # dictionary - records not built into objects yet, by <class name>
+    __pending = {}
+    # tuple - the attributes the objects of a class are kept sorted by
+    __orders = ("id", "created_at")
+    # dictionary - (<has value>, value, key) of the objects of a class sorted
+    # by one of __orders, by (<class name>, attribute), built when first used
+    __sorted = {}
+    # lock - held as a reader to look objects up and to write the file, as
+    # the writer to change __objects, the indexes or __pending
+    __lock = RWLock()
+    # lock - taken by save(), one thread writes the file at a time
+    __io = Lock()
+    # how many transaction() blocks each thread is in, the objects it
+    # changed through new() or delete() in them with their snapshot() by key
+    # and __saves when the outermost one began
+    __local = local()
+
+    @staticmethod
+    def __stat(name):
+        """returns the inode, size and mtime of a file, None if missing"""
+        try:
+            st = stat(name)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def __buckets(self):
+        """returns the per-class index, rebuilt with the reference index if
+        __objects was replaced"""
+        if FileStorage.__indexed is not FileStorage.__objects:
+            FileStorage.__by_class = {}
+            FileStorage.__referrers = {}
+            for key, value in FileStorage.__objects.items():
+                bucket = FileStorage.__by_class.setdefault(
+                    value.__class__.__name__, {})
+                bucket[key] = value
+                self.__link(key, value.__class__.__name__, value.__dict__)
+            for name, pending in FileStorage.__pending.items():
+                for key, fields in pending.items():
+                    self.__link(key, name, fields)
+            FileStorage.__sorted = {}
+            FileStorage.__indexed = FileStorage.__objects
+        return FileStorage.__by_class
+
+    def __link(self, key, name, fields, add=True):
+        """adds key to, or removes it from, the reference index under the
+        ids held in fields by an object of class name"""
+        for attr in self.__references:
+            values = fields.get(attr)
+            if not values:
+                continue
+            if not isinstance(values, list):
+                values = [values]
+            ids = self.__referrers.setdefault((name, attr), {})
+            for value in values:
+                if add:
+                    ids.setdefault(value, {})[key] = True
+                elif key in ids.get(value, {}):
+                    del ids[value][key]
+                    if not ids[value]:
+                        del ids[value]
+
+    def __put(self, key, obj):
+        """stores obj under key in __objects and the indexes"""
+        name = obj.__class__.__name__
+        self.__buckets().setdefault(name, {})[key] = obj
+        old = self.__objects.get(key)
+        if old is not None:
+            self.__link(key, old.__class__.__name__, old.__dict__, False)
+            self.__sort(key, old, False)
+        self.__objects[key] = obj
+        self.__link(key, name, obj.__dict__)
+        self.__sort(key, obj)
+
+    def __sort(self, key, obj, add=True):
+        """adds key to, or removes it from, the sorted lists of the class of
+        obj"""
+        name = obj.__class__.__name__
+        for field in self.__orders:
+            index = self.__sorted.get((name, field))
+            if index is None:
+                continue
+            value = obj.__dict__.get(field)
+            entry = (value is not None, value, key)
+            if add:
+                bisect.insort(index, entry)
+                continue
+            i = bisect.bisect_left(index, entry)
+            if i < len(index) and index[i] == entry:
+                del index[i]
+
+    def __discard(self, key):
+        """removes key from __objects, the indexes and the records pending
+        hydration, returns True if it was stored"""
+        name = key.partition(".")[0]
+        fields = self.__pending.get(name, {}).pop(key, None)
+        if fields is not None:
+            self.__link(key, name, fields, False)
+        obj = self.__objects.pop(key, None)
+        if obj is not None:
+            name = obj.__class__.__name__
+            self.__buckets().get(name, {}).pop(key, None)
+            self.__link(key, name, obj.__dict__, False)
+            self.__sort(key, obj, False)
+        return obj is not None or fields is not None
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
-        if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
-        return self.__objects
+    def __restore(self, key, fields):
+        """stores the object read from disk as fields under key, in lazy mode
+        the fields are kept as they are until the object is accessed"""
+        cls = classes[fields["__class__"]]
+        if self.__lazy:
+            self.__discard(key)
+            self.__pending.setdefault(cls.__name__, {})[key] = fields
+            self.__link(key, cls.__name__, fields)
+            for field in self.__orders:
+                self.__sorted.pop((cls.__name__, field), None)
+        else:
+            self.__put(key, self.__build(cls, fields))
+
+    @staticmethod
+    def __build(cls, fields):
+        """returns the object of class cls read from disk as fields"""
+        obj = cls(**fields)
+        obj.mark_saved()
+        return obj
+
+    def __patch(self, key, fields, rebase=False):
+        """updates the object stored under key with the fields a partial
+        journal record holds, if rebase is True only the attributes it did
+        not change since save()"""
+        obj = self.__objects.get(key)
+        if obj is not None:
+            record = obj.to_dict()
+        else:
+            record = self.__pending.get(key.partition(".")[0], {}).get(key)
+            if record is None:
+                return
+            record = dict(record)
+        record.update(fields)
+        if rebase:
+            self.__rebase(key, record)
+        else:
+            self.__restore(key, record)
+
+    def __rebase(self, key, fields):
+        """updates the object stored under key, changed since save(), with
+        the attributes of fields, the record read from disk, it did not
+        change"""
+        obj = self.__objects.get(key)
+        if obj is None:
+            return
+        name = obj.__class__.__name__
+        self.__link(key, name, obj.__dict__, False)
+        self.__sort(key, obj, False)
+        obj.rebase(self.__build(classes[fields["__class__"]], fields))
+        self.__link(key, name, obj.__dict__)
+        self.__sort(key, obj)
+
+    def __hydrate(self, name, key=None):
+        """builds the pending objects of class name, or only the one under
+        key, and moves them to __objects"""
+        pending = self.__pending.get(name)
+        if not pending:
+            return
+        if key is None:
+            records = list(pending.items())
+            pending.clear()
+        elif key in pending:
+            records = [(key, pending.pop(key))]
+        else:
+            return
+        for key, fields in records:
+            self.__put(key, self.__build(classes[name], fields))
+
+    @contextmanager
+    def __access(self, pending):
+        """holds the lock as a reader, or as the writer if pending(), called
+        under the read lock, returns True as the objects looked up are
+        pending hydration and looking them up builds them"""
+        with self.__lock.reading():
+            if not pending():
+                yield
+                return
+        with self.__lock.writing():
+            yield
+
+    def __pending_key(self, key):
+        """returns True if the object under key is pending hydration"""
+        return key in self.__pending.get(key.partition(".")[0], ())
+
+    def all(self, cls=None, load=None):
+        """returns the dictionary __objects, load is accepted for DBStorage
+        compatibility as relationships are found through the indexes"""
+        if cls is not None and not isinstance(cls, str):
+            cls = cls.__name__
+        with self.__access(lambda: any(self.__pending.values())
+                           if cls is None else self.__pending.get(cls)):
+            if cls is not None:
+                self.__hydrate(cls)
+                return dict(self.__buckets().get(cls, {}))
+            for name in list(self.__pending):
+                self.__hydrate(name)
+            return self.__objects
+
+    def iter_all(self, cls=None, batch_size=1000):
+        """yields the objects of class cls, or of every class in the order
+        all() holds them, building and looking them up batch_size at a time
+        without holding the lock while they are consumed"""
+        if cls is not None and not isinstance(cls, str):
+            cls = cls.__name__
+        with self.__lock.reading():
+            if cls is None:
+                keys = list(self.__objects)
+                for pending in self.__pending.values():
+                    keys.extend(pending)
+            else:
+                keys = list(self.__buckets().get(cls, {}))
+                keys.extend(self.__pending.get(cls, {}))
+        for i in range(0, len(keys), batch_size):
+            chunk = keys[i:i + batch_size]
+            with self.__access(lambda: any(map(self.__pending_key, chunk))):
+                batch = []
+                for key in chunk:
+                    self.__hydrate(key.partition(".")[0], key)
+                    obj = self.__objects.get(key)
+                    if obj is not None:
+                        batch.append(obj)
+            yield from batch
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            name = obj.__class__.__name__
+            with self.__lock.writing():
+                fields = self.__pending.get(name, {}).pop(key, None)
+                if fields is not None:
+                    self.__link(key, name, fields, False)
+                self.__put(key, obj)
+                self.__deleted.pop(key, None)
+                self.__dirty[key] = True
+            if self.in_transaction():
+                self.__local.touched.setdefault(key, (obj, obj.snapshot()))
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        """serializes __objects to the JSON file (path: __file_path) after
+        merging in what other processes saved since it was last read, unless
+        in a transaction() block"""
+        if self.in_transaction():
+            return
+        with self.__io, self.__locked(exclusive=True):
+            if self.__stale():
+                with self.__lock.writing():
+                    self.__sync()
+            # readers keep going while the file is written, writers wait
+            with self.__lock.reading():
+                if self.__journal and not self.__fallback:
+                    self.__append()
+                else:
+                    self.__compact()
+
+    def in_transaction(self):
+        """returns True if the current thread is in a transaction() block"""
+        return getattr(self.__local, "depth", 0) > 0
+
+    @contextmanager
+    def transaction(self):
+        """defers save() until the outermost transaction() block exits, then
+        saves once, or puts the objects changed through new() or delete() in
+        the block back as they were before it if it raises"""
+        depth = getattr(self.__local, "depth", 0)
+        if not depth:
+            self.__local.touched = {}
+            self.__local.saves = FileStorage.__saves
+        self.__local.depth = depth + 1
+        try:
+            yield self
+        except BaseException:
+            self.__local.depth = depth
+            if not depth:
+                # another thread saving during the block may have written
+                # its changes, which then have to be written over
+                written = FileStorage.__saves != self.__local.saves
+                with self.__lock.writing():
+                    self.__rollback(self.__local.touched, written)
+                if written:
+                    self.save()
+            raise
+        self.__local.depth = depth
+        if not depth:
+            self.save()
+
+    def batch(self):
+        """same as transaction()"""
+        return self.transaction()
+
+    def __rollback(self, touched, written):
+        """puts back each object of touched, a key -> (object, snapshot())
+        dictionary, as its snapshot holds it, or drops it if it has none,
+        leaving it to be saved if written is True"""
+        for key, (obj, attributes) in touched.items():
+            self.__discard(key)
+            self.__dirty.pop(key, None)
+            self.__deleted.pop(key, None)
+            if attributes is None:
+                if written:
+                    self.__deleted[key] = True
+                continue
+            obj.restore(attributes)
+            self.__put(key, obj)
+            if written:
+                self.__dirty[key] = True
+            else:
+                obj.mark_saved()
+
+    @contextmanager
+    def __locked(self, exclusive=False):
+        """holds the advisory lock processes sharing the JSON file take to
+        write it, or to read it if exclusive is False, there is nothing to
+        read and no lock file is made while neither file exists"""
+        if not exclusive and self.__source() is None:
+            yield
+            return
+        try:
+            f = open(self.__file_path + ".lock", 'a') if fcntl else None
+        except OSError:
+            f = None
+        if f is None:
+            yield
+            return
+        with f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+
+    def __source(self):
+        """returns the path of the file to read: __file_path, or the JSON
+        file next to it when neither it nor its journal exists, written
+        before another format was chosen, None if there is nothing to read"""
+        for name in [self.__file_path,
+                     path.splitext(self.__file_path)[0] + ".json"]:
+            if path.exists(name) or path.exists(name + ".log"):
+                return name
+        return None
+
+    def __records(self):
+        """yields the key and to_dict() of every object, built or not"""
+        for key, obj in self.__objects.items():
+            yield key, self.__serializer.encode(obj)
+        for pending in self.__pending.values():
+            yield from pending.items()
+
+    def __compact(self):
+        """rewrites the JSON file from __objects and empties the journal"""
+        with open(self.__file_path + ".tmp", 'wb') as f:
+            self.__serializer.dump(self.__records(), f)
+        FileStorage.__fallback = False
+        replace(self.__file_path + ".tmp", self.__file_path)
+        # a crash before this point only leaves records that replay to
+        # the state the new snapshot already holds
+        if path.exists(self.__file_path + ".log"):
+            remove(self.__file_path + ".log")
+        FileStorage.__stamp = self.__stat(self.__file_path)
+        FileStorage.__applied = 0
+        self.__saved()
+
+    def __saved(self):
+        """forgets the changes made since the last save() now that they are
+        on disk"""
+        for key in self.__dirty:
+            obj = self.__objects.get(key)
+            if obj is not None:
+                obj.mark_saved()
+        self.__dirty.clear()
+        self.__deleted.clear()
+        FileStorage.__saves += 1
+
+    def __append(self):
+        """appends the changes since the last save to the journal, only the
+        attributes that changed for objects already on disk"""
+        records = [json.dumps(["del", key]) for key in self.__deleted]
+        for key in self.__dirty:
+            obj = self.__objects.get(key)
+            if obj is None:
+                continue
+            changed = obj.changed()
+            fields = obj.to_dict()
+            # only a new object has its id set since it was last saved
+            if "id" in changed:
+                records.append(json.dumps(["put", key, fields]))
+            elif changed:
+                records.append(json.dumps(["patch", key, {
+                    name: fields[name] for name in changed
+                    if name in fields}]))
+        with open(self.__file_path + ".log", 'a') as f:
+            f.write("".join(record + "\n" for record in records))
+            size = f.tell()
+        FileStorage.__applied = size
+        self.__saved()
+        if size > self.__journal_max:
+            self.__compact()
 
     def reload(self):
         """deserializes the JSON file to __objects"""
+        with self.__locked(), self.__lock.writing():
+            self.__load()
+
+    def __load(self, merge=False):
+        """reads the JSON file then its journal, if merge is True objects
+        holding the same fields are kept instead of rebuilt, the ones changed
+        since save() keep the attributes changed and the others missing from
+        the file are dropped"""
+        stamp = self.__stat(self.__file_path)
+        source = self.__source() or self.__file_path
+        seen = {}
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
+            with open(source, 'rb') as f:
+                for key, fields in serializers.load(f):
+                    seen[key] = True
+                    if merge and self.__current(key, fields):
+                        continue
+                    if merge and self.__changed(key):
+                        self.__rebase(key, fields)
+                    else:
+                        self.__restore(key, fields)
         except:
-            pass
+            seen = None
+        if merge and seen is not None:
+            keys = list(self.__objects)
+            for pending in self.__pending.values():
+                keys.extend(pending)
+            for key in keys:
+                if key not in seen and not self.__changed(key):
+                    self.__discard(key)
+        FileStorage.__stamp = stamp
+        FileStorage.__applied = 0
+        self.__replay(merge, source)
+        FileStorage.__fallback = source != self.__file_path
+        if self.__fallback:
+            FileStorage.__applied = 0
+
+    def __changed(self, key):
+        """returns True if key was changed through new() or delete() since
+        the last save()"""
+        return key in self.__dirty or key in self.__deleted
+
+    def __sync(self):
+        """brings __objects up to date with the JSON file and its journal,
+        keeping the changes made since the last save()"""
+        if self.__stat(self.__file_path) != self.__stamp:
+            self.__load(merge=True)
+        else:
+            self.__replay()
+
+    def __current(self, key, fields):
+        """returns True if the object stored under key holds what the one
+        read from disk as fields does, whether or not its updated_at moved"""
+        if key in self.__objects:
+            record = self.__objects[key].to_dict()
+        else:
+            name = key.partition(".")[0]
+            record = self.__pending.get(name, {}).get(key)
+            if record is None:
+                return False
+        return serializers.strings(record) == serializers.strings(fields)
+
+    def __stale(self):
+        """returns True if the JSON file or its journal changed since they
+        were last read or written"""
+        if self.__stat(self.__file_path) != self.__stamp:
+            return True
+        try:
+            return path.getsize(self.__file_path + ".log") != self.__applied
+        except OSError:
+            return self.__applied != 0
+
+    def __replay(self, merge=True, source=None):
+        """applies the journal past the records already applied on top of
+        the snapshot, dropping a torn tail, if merge is True the objects
+        changed since save() only take the attributes they did not change,
+        source is the path of the snapshot when not __file_path"""
+        log = (source or self.__file_path) + ".log"
+        try:
+            size = path.getsize(log)
+        except OSError:
+            FileStorage.__applied = 0
+            return
+        if size == self.__applied:
+            return
+        if size < self.__applied:
+            FileStorage.__applied = 0
+        with open(log, 'rb') as f:
+            valid = f.seek(self.__applied)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if merge and self.__changed(record[1]):
+                    if record[0] == "put":
+                        self.__rebase(record[1], record[2])
+                    elif record[0] == "patch":
+                        self.__patch(record[1], record[2], rebase=True)
+                elif record[0] == "put":
+                    self.__restore(record[1], record[2])
+                elif record[0] == "patch":
+                    self.__patch(record[1], record[2])
+                else:
+                    self.__discard(record[1])
+                valid += len(line)
+            torn = valid < f.seek(0, 2)
+        if torn:
+            with open(log, 'r+b') as f:
+                f.truncate(valid)
+        FileStorage.__applied = valid
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            with self.__lock.writing():
+                if self.__discard(key):
+                    self.__dirty.pop(key, None)
+                    self.__deleted[key] = True
+            if self.in_transaction():
+                self.__local.touched.setdefault(key, (obj, obj.snapshot()))
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """reloads what changed in the JSON file or its journal since it was
+        last read or written, does nothing if neither changed"""
+        with self.__lock.reading():
+            if not self.__stale():
+                return
+        with self.__locked(), self.__lock.writing():
+            self.__sync()
 
-    def get(self, cls, id):
-        """method to retrieve one object based on cls and id"""
-        try:
-            return self.all(cls).get("{}.{}".format(cls, id))
-        except:
-            return None
+    def get(self, cls, id, load=None):
+        """method to retrieve one object based on cls and id, load is
+        accepted for DBStorage compatibility"""
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        key = "{}.{}".format(cls, id)
+        with self.__access(lambda: self.__pending_key(key)):
+            self.__hydrate(cls, key)
+            return self.__objects.get(key)
 
     def count(self, cls=None):
         """method to count the number of objects in storage"""
         if cls:
-            try:
-                return len(self.all(cls))
-            except:
-                return None
+            if not isinstance(cls, str):
+                cls = cls.__name__
+            with self.__lock.reading():
+                return len(self.__buckets().get(cls, {})) + \
+                    len(self.__pending.get(cls, {}))
         else:
-            return len(self.all())
+            return sum(self.counts().values())
+
+    def counts(self):
+        """returns the number of objects of each class"""
+        with self.__lock.reading():
+            buckets = self.__buckets()
+            return {name: len(buckets.get(name, {})) +
+                    len(self.__pending.get(name, {})) for name in classes}
+
+    def referrers(self, cls, name, id):
+        """returns the objects of class cls whose attribute name is id"""
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        if name not in self.__references:
+            return [obj for obj in self.all(cls).values()
+                    if getattr(obj, name, None) == id]
+        with self.__access(lambda: self.__pending.get(cls)):
+            self.__buckets()
+            keys = list(self.__referrers.get((cls, name), {}).get(id, ()))
+            for key in keys:
+                self.__hydrate(cls, key)
+            return [self.__objects[key] for key in keys]
+
+    def query(self, cls):
+        """returns a Query on the objects of class cls"""
+        if isinstance(cls, str):
+            cls = classes[cls]
+        return FileQuery(cls, self, ("id",) + self.__references,
+                         self.__ordered)
+
+    def page(self, cls, limit, after=None, order_by="id"):
+        """returns up to limit objects of class cls ordered by order_by, the
+        ones following the cursor after if given, and the cursor of the next
+        page, None on the last page"""
+        return self.query(cls).order_by(order_by).page(limit, after)
+
+    def __ordered(self, name, field, start, limit):
+        """returns up to limit objects of class name in the order of field,
+        following start, a (value, id) pair, if given, None if the objects
+        are not kept sorted by field"""
+        if field not in self.__orders:
+            return None
+        with self.__lock.reading():
+            self.__buckets()
+            index = self.__sorted.get((name, field))
+            if index is not None:
+                return self.__slice(index, name, start, limit)
+        with self.__lock.writing():
+            self.__hydrate(name)
+            index = self.__sorted.get((name, field))
+            if index is None:
+                index = []
+                for key, obj in self.__buckets().get(name, {}).items():
+                    value = obj.__dict__.get(field)
+                    index.append((value is not None, value, key))
+                index.sort()
+                self.__sorted[(name, field)] = index
+            return self.__slice(index, name, start, limit)
+
+    def __slice(self, index, name, start, limit):
+        """returns the limit objects following start in the sorted list
+        index of class name"""
+        i = 0
+        if start is not None:
+            i = bisect.bisect_right(index, (start[0] is not None, start[0],
+                                            name + "." + start[1]))
+        return [self.__objects[entry[2]] for entry in index[i:i + limit]]
+
+    def reindex(self, obj, name, old):
+        """moves obj in the reference index after its attribute name changed
+        from old, an id or a list of ids"""
+        if name not in self.__references:
+            return
+        key = "{}.{}".format(obj.__class__.__name__, obj.__dict__.get("id"))
+        with self.__lock.writing():
+            if self.__objects.get(key) is not obj:
+                return
+            cls = obj.__class__.__name__
+            self.__link(key, cls, {name: old}, False)
+            self.__link(key, cls, {name: obj.__dict__.get(name)})
+
+    def link(self, place, amenity):
+        """adds amenity to the amenities of place"""
+        with self.__lock.writing():
+            if amenity.id not in place.amenity_ids:
+                # a new list, so that reindex() is told the ids it replaces
+                place.amenity_ids = place.amenity_ids + [amenity.id]
+                self.new(place)
+
+    def unlink(self, place, amenity):
+        """removes amenity from the amenities of place"""
+        with self.__lock.writing():
+            if amenity.id in place.amenity_ids:
+                place.amenity_ids = [amenity_id
+                                     for amenity_id in place.amenity_ids
+                                     if amenity_id != amenity.id]
+                self.new(place)
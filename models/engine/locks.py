@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+"""
+Contains the locks the storage engines share between threads
+"""
+
+from contextlib import contextmanager
+from threading import Condition, get_ident
+
+
+class RWLock:
+    """a lock held by any number of readers or by a single writer
+
+    Both sides are reentrant and the writer may also read. Readers that
+    arrive while a writer waits queue behind it so writers do not starve.
+    """
+
+    def __init__(self):
+        """Initializes an unlocked lock"""
+        self.__cond = Condition()
+        self.__readers = {}
+        self.__writer = None
+        self.__writes = 0
+        self.__waiting = 0
+
+    @contextmanager
+    def reading(self):
+        """holds the lock as a reader for the duration of the with block"""
+        me = get_ident()
+        with self.__cond:
+            if self.__writer != me:
+                if me not in self.__readers:
+                    while self.__writer is not None or self.__waiting:
+                        self.__cond.wait()
+                self.__readers[me] = self.__readers.get(me, 0) + 1
+        try:
+            yield
+        finally:
+            with self.__cond:
+                if me in self.__readers:
+                    self.__readers[me] -= 1
+                    if not self.__readers[me]:
+                        del self.__readers[me]
+                        self.__cond.notify_all()
+
+    @contextmanager
+    def writing(self):
+        """holds the lock as the writer for the duration of the with block"""
+        me = get_ident()
+        with self.__cond:
+            if self.__writer != me:
+                if me in self.__readers:
+                    raise RuntimeError("cannot write while reading")
+                self.__waiting += 1
+                while self.__writer is not None or self.__readers:
+                    self.__cond.wait()
+                self.__waiting -= 1
+                self.__writer = me
+            self.__writes += 1
+        try:
+            yield
+        finally:
+            with self.__cond:
+                self.__writes -= 1
+                if not self.__writes:
+                    self.__writer = None
+                    self.__cond.notify_all()
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""
+Contains the connection pool DBStorage measures checkouts with
+"""
+
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
+from threading import Lock
+import time
+
+
+class TimedQueuePool(QueuePool):
+    """a QueuePool that records how long checkouts wait for a connection
+    and how often every connection it may open is in use"""
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate a TimedQueuePool, see QueuePool"""
+        super().__init__(*args, **kwargs)
+        self.__lock = Lock()
+        self.__checkouts = 0
+        self.__saturated = 0
+        self.__timeouts = 0
+        self.__wait = 0.0
+        self.__wait_max = 0.0
+        self.__peak = 0
+
+    def _do_get(self):
+        """checks a connection out, timing the wait"""
+        saturated = self._max_overflow >= 0 and \
+            self.checkedout() >= self.size() + self._max_overflow
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except TimeoutError:
+            with self.__lock:
+                self.__timeouts += 1
+            raise
+        wait = time.perf_counter() - start
+        with self.__lock:
+            self.__checkouts += 1
+            self.__saturated += saturated
+            self.__wait += wait
+            self.__wait_max = max(self.__wait_max, wait)
+            self.__peak = max(self.__peak, self.checkedout())
+        return connection
+
+    def stats(self):
+        """returns the size and usage of the pool, times in milliseconds"""
+        with self.__lock:
+            return {"size": self.size(),
+                    "max_overflow": self._max_overflow,
+                    "checked_out": self.checkedout(),
+                    "peak_checked_out": self.__peak,
+                    "checkouts": self.__checkouts,
+                    "saturated": self.__saturated,
+                    "timeouts": self.__timeouts,
+                    "wait_total_ms": round(self.__wait * 1000, 3),
+                    "wait_max_ms": round(self.__wait_max * 1000, 3)}
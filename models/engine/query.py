@@ -0,0 +1,144 @@
+#!/usr/bin/python3
+"""
+Contains the Query class the storage engines return from query()
+"""
+
+import base64
+import copy
+from datetime import datetime
+import json
+from models.base_model import format_time, parse_time
+import operator
+
+# dictionary - the comparison of each operator a filter() keyword may end in
+operators = {"eq": operator.eq, "ne": operator.ne, "lt": operator.lt,
+             "lte": operator.le, "gt": operator.gt, "gte": operator.ge,
+             "in": lambda value, values: value in values}
+
+
+def parse(conditions):
+    """returns the (field, operator, value) tuples of the filter() keywords
+    in conditions, field=value or field__<operator>=value"""
+    parsed = []
+    for name, value in conditions.items():
+        field, _, op = name.partition("__")
+        op = op or "eq"
+        if op not in operators:
+            raise ValueError("unknown operator: {}".format(op))
+        if op == "in":
+            value = list(value)
+        parsed.append((field, op, value))
+    return parsed
+
+
+def matches(obj, conditions):
+    """returns True if obj meets every condition, a list attribute meets a
+    condition when one of the ids it holds does"""
+    for field, op, value in conditions:
+        attr = getattr(obj, field, None)
+        values = attr if isinstance(attr, list) else [attr]
+        for attr in values:
+            if attr is None and op not in ("eq", "ne", "in"):
+                continue
+            if operators[op](attr, value):
+                break
+        else:
+            return False
+    return True
+
+
+def cursor(field, obj):
+    """returns the cursor of the objects following obj when they are ordered
+    by field"""
+    value = getattr(obj, field, None)
+    if isinstance(value, datetime):
+        value = {"datetime": format_time(value)}
+    data = json.dumps([field, value, obj.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def position(field, after):
+    """returns the value of field and the id of the object the cursor after
+    was made from, raises ValueError if it is not a cursor on field"""
+    try:
+        data = base64.urlsafe_b64decode(after + "=" * (-len(after) % 4))
+        name, value, id = json.loads(data)
+        if isinstance(value, dict):
+            value = parse_time(value["datetime"])
+    except (TypeError, ValueError, KeyError, AttributeError):
+        raise ValueError("invalid cursor: {}".format(after))
+    if name != field or not isinstance(id, str):
+        raise ValueError("cursor not ordered by {}".format(field))
+    return value, id
+
+
+def ordering(field):
+    """returns the sort key ordering objects by field then id, objects
+    without a value for field first"""
+    def key(obj):
+        value = getattr(obj, field, None)
+        return (value is not None, value, obj.id)
+    return key
+
+
+class Query:
+    """the objects of one class that meet the conditions given to filter(),
+    fetched when all(), first() or count() is called"""
+
+    def __init__(self, cls):
+        """Instantiate a Query on every object of class cls"""
+        self.cls = cls
+        self.conditions = []
+        self.order = None
+
+    def filter(self, **conditions):
+        """returns a Query narrowed to the objects that also meet conditions
+        """
+        query = copy.copy(self)
+        query.conditions = self.conditions + parse(conditions)
+        return query
+
+    def order_by(self, field):
+        """returns the Query with its objects ordered by field, then id"""
+        query = copy.copy(self)
+        query.order = field
+        return query
+
+    def all(self):
+        """returns the list of matching objects"""
+        raise NotImplementedError
+
+    def page(self, limit, after=None):
+        """returns up to limit matching objects, the ones following the
+        cursor after if given, and the cursor of the next page, None on
+        the last page"""
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        field = self.order or "id"
+        objs = sorted(self.all(), key=ordering(field))
+        if after is not None:
+            value, id = position(field, after)
+            start = (value is not None, value, id)
+            objs = [obj for obj in objs if ordering(field)(obj) > start]
+        return self.paged(objs[:limit + 1], field, limit)
+
+    @staticmethod
+    def paged(objs, field, limit):
+        """returns the first limit objects of objs and the cursor of the
+        next page if objs holds more"""
+        if len(objs) > limit:
+            return objs[:limit], cursor(field, objs[limit - 1])
+        return objs, None
+
+    def first(self):
+        """returns a matching object, None if there is none"""
+        objs = self.all()
+        return objs[0] if objs else None
+
+    def count(self):
+        """returns the number of matching objects"""
+        return len(self.all())
+
+    def __iter__(self):
+        """iterates over the matching objects"""
+        return iter(self.all())
@@ -0,0 +1,239 @@
+#!/usr/bin/python3
+"""
+Contains the formats FileStorage can read and write its file in
+"""
+
+from datetime import datetime, timedelta
+import io
+import json
+import marshal
+from models.base_model import format_time, parse_time
+import re
+import struct
+import sys
+
+
+def iterload(f, size=1 << 16):
+    """yields the key/value pairs of the JSON object in the text file f one
+    at a time, reading it size characters at a time"""
+    scan = json.JSONDecoder().scan_once
+    separator = re.compile(r'[ \t\n\r]*([^ \t\n\r])[ \t\n\r]*').match
+    buf = ""
+    pos = 0
+    expected = "{"
+    while True:
+        if expected == "key" or expected == "value":
+            try:
+                token, end = scan(buf, pos)
+            except (StopIteration, ValueError):
+                end = None
+            # a value is always followed by a separator, so one ending with
+            # the buffer may have been cut short
+            if end is not None and end < len(buf):
+                pos = end
+                if expected == "value":
+                    expected = ",}"
+                    yield key, token
+                elif isinstance(token, str):
+                    key = token
+                    expected = ":"
+                else:
+                    raise ValueError("expected a string key")
+                continue
+        else:
+            m = separator(buf, pos)
+            if m is not None:
+                char = m.group(1)
+                if char == "}" and "}" in expected:
+                    return
+                if expected == "key}":
+                    expected = "key"
+                    continue
+                if char not in expected:
+                    raise ValueError("unexpected {!r}".format(char))
+                pos = m.end()
+                expected = {"{": "key}", ":": "value", ",": "key"}[char]
+                continue
+        chunk = f.read(size)
+        if not chunk:
+            raise ValueError("unexpected end of the JSON file")
+        buf = buf[pos:].lstrip(" \t\n\r") + chunk
+        pos = 0
+
+
+def iterdump(records, f, size=1 << 10):
+    """writes the key/value pairs of records to the text file f as one JSON
+    object, encoding size records at a time"""
+    f.write("{")
+    batch = []
+    separator = ""
+    for key, value in records:
+        batch.append(json.dumps(key) + ": " + json.dumps(value))
+        if len(batch) == size:
+            f.write(separator + ", ".join(batch))
+            batch = []
+            separator = ", "
+    if batch:
+        f.write(separator + ", ".join(batch))
+    f.write("}")
+
+
+def strings(fields):
+    """returns fields with datetime timestamps formatted as strings"""
+    if isinstance(fields.get("created_at"), datetime) or \
+       isinstance(fields.get("updated_at"), datetime):
+        fields = dict(fields)
+        for name in ["created_at", "updated_at"]:
+            if isinstance(fields.get(name), datetime):
+                fields[name] = format_time(fields[name])
+    return fields
+
+
+class JSONSerializer:
+    """reads and writes the objects as the JSON object of their to_dict()"""
+    name = "json"
+    path = "file.json"
+
+    def encode(self, obj):
+        """returns the fields of obj as they are written to the file"""
+        return obj.to_dict()
+
+    def dump(self, records, f):
+        """writes the key/fields pairs of records to the binary file f"""
+        text = io.TextIOWrapper(f, encoding="utf-8")
+        iterdump(((key, strings(fields)) for key, fields in records),
+                 text)
+        text.detach()
+
+    def load(self, f):
+        """yields the key/fields pairs read from the binary file f"""
+        text = io.TextIOWrapper(f, encoding="utf-8")
+        try:
+            yield from iterload(text)
+        finally:
+            text.detach()
+
+
+class BinarySerializer:
+    """reads and writes the objects in a compact binary format
+
+    The file starts with a header holding the HBNB magic number, the version
+    of the format and the version of marshal, followed by chunks that each
+    are a 4 bytes length and the marshal of a tuple of class names and a
+    list of records. A record is a tuple of the index of its class name,
+    its id, its created_at and updated_at as microseconds since the epoch
+    and a dictionary of its other attributes. An empty chunk ends the file.
+    """
+    name = "binary"
+    path = "file.hbnb"
+    magic = b"HBNB"
+    version = 1
+    header = struct.Struct(">4sHH")
+    length = struct.Struct(">I")
+    epoch = datetime(1970, 1, 1)
+    microsecond = timedelta(microseconds=1)
+
+    def __init__(self, size=1 << 12):
+        """sets the number of records written per chunk"""
+        self.size = size
+
+    def encode(self, obj):
+        """returns the fields of obj as they are written to the file"""
+        fields = obj.__dict__.copy()
+        fields.pop("_sa_instance_state", None)
+        fields["__class__"] = obj.__class__.__name__
+        return fields
+
+    def dump(self, records, f):
+        """writes the key/fields pairs of records to the binary file f"""
+        f.write(self.header.pack(self.magic, self.version, marshal.version))
+        names = {}
+        chunk = []
+        for key, fields in records:
+            fields = dict(fields)
+            index = names.setdefault(fields.pop("__class__"), len(names))
+            chunk.append((index, fields.pop("id"),
+                          self.__micros(fields.pop("created_at")),
+                          self.__micros(fields.pop("updated_at")),
+                          fields))
+            if len(chunk) == self.size:
+                self.__write(f, names, chunk)
+                names = {}
+                chunk = []
+        if chunk:
+            self.__write(f, names, chunk)
+        f.write(self.length.pack(0))
+
+    def load(self, f):
+        """yields the key/fields pairs read from the binary file f"""
+        magic, version, marshal_version = self.header.unpack(
+            self.__read(f, self.header.size))
+        if magic != self.magic or version != self.version:
+            raise ValueError("not a version {} HBNB file".format(
+                self.version))
+        # marshal reads the versions before its own, the file is then
+        # rewritten in the current one on the next save
+        if marshal_version > marshal.version:
+            raise ValueError("HBNB file written with marshal version {}, "
+                             "newer than {}".format(marshal_version,
+                                                    marshal.version))
+        epoch = self.epoch
+        microsecond = self.microsecond
+        while True:
+            size, = self.length.unpack(self.__read(f, self.length.size))
+            if size == 0:
+                return
+            names, chunk = marshal.loads(self.__read(f, size))
+            for index, id, created_at, updated_at, fields in chunk:
+                fields["__class__"] = names[index]
+                fields["id"] = id
+                fields["created_at"] = epoch + created_at * microsecond
+                fields["updated_at"] = epoch + updated_at * microsecond
+                yield names[index] + "." + id, fields
+
+    def __micros(self, value):
+        """returns a datetime, or a string in the to_dict() format, as the
+        number of microseconds since the epoch"""
+        if isinstance(value, str):
+            value = parse_time(value)
+        return (value - self.epoch) // self.microsecond
+
+    def __write(self, f, names, chunk):
+        """writes one chunk of records"""
+        data = marshal.dumps((tuple(names), chunk))
+        f.write(self.length.pack(len(data)))
+        f.write(data)
+
+    @staticmethod
+    def __read(f, size):
+        """reads exactly size bytes from f"""
+        data = f.read(size)
+        if len(data) != size:
+            raise ValueError("unexpected end of the HBNB file")
+        return data
+
+
+serializers = {"json": JSONSerializer(), "binary": BinarySerializer()}
+
+
+def load(f):
+    """yields the key/fields pairs of the binary file f in whichever format
+    its first bytes show it was written in"""
+    if f.peek(len(BinarySerializer.magic)).startswith(BinarySerializer.magic):
+        return serializers["binary"].load(f)
+    return serializers["json"].load(f)
+
+
+def convert(src, dst, name):
+    """rewrites the file src to dst in the format called name"""
+    with open(src, "rb") as f:
+        with open(dst, "wb") as out:
+            serializers[name].dump(load(f), out)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[3] not in serializers:
+        print("Usage: {} <source> <destination> <{}>".format(
+            sys.argv[0], "|".join(serializers)))
+        sys.exit(1)
+    convert(*sys.argv[1:])
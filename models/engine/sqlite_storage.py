@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+"""
+Contains the class SQLiteStorage
+"""
+
+from models.engine.db_storage import DBStorage
+from os import getenv
+from sqlalchemy import create_engine, event
+
+
+class SQLiteStorage(DBStorage):
+    """interacts with an SQLite database file"""
+    # dictionary - the pragmas set on every new connection, WAL lets readers
+    # go on while a transaction writes and synchronous=NORMAL only syncs
+    # the log at checkpoints
+    pragmas = {"journal_mode": "WAL", "synchronous": "NORMAL",
+               "foreign_keys": "ON", "busy_timeout": 5000,
+               "cache_size": -16000, "temp_store": "MEMORY"}
+
+    def connect(self, path=None):
+        """returns the engine of the SQLite database at path, by default
+        HBNB_SQLITE_PATH"""
+        HBNB_SQLITE_PATH = path or getenv('HBNB_SQLITE_PATH', 'hbnb.db')
+        # each thread's scoped session checks out its own connection
+        engine = create_engine('sqlite:///{}'.format(HBNB_SQLITE_PATH),
+                               connect_args={"check_same_thread": False},
+                               **self.pool_options())
+        event.listen(engine, "connect", self.configure)
+        event.listen(engine, "begin", self.begin)
+        return engine
+
+    def replicas(self):
+        """returns the engines of the read replicas at the comma separated
+        HBNB_SQLITE_REPLICA_PATHS"""
+        HBNB_SQLITE_REPLICA_PATHS = getenv('HBNB_SQLITE_REPLICA_PATHS', '')
+        return [self.connect(path.strip())
+                for path in HBNB_SQLITE_REPLICA_PATHS.split(',')
+                if path.strip()]
+
+    def configure(self, connection, record):
+        """sets the pragmas on a new connection and takes over transactions
+        from the driver, which does not begin them before reads"""
+        connection.isolation_level = None
+        cursor = connection.cursor()
+        for name, value in self.pragmas.items():
+            cursor.execute("PRAGMA {} = {}".format(name, value))
+        cursor.close()
+
+    def begin(self, connection):
+        """begins the transaction SQLAlchemy starts on connection"""
+        connection.exec_driver_sql("BEGIN")
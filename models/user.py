@@ -4,7 +4,7 @@ import models
 from models.base_model import BaseModel, Base
 from os import getenv
 import sqlalchemy
-from sqlalchemy import Column, String
+from sqlalchemy import Column, String, Index
 from sqlalchemy.orm import relationship
 from hashlib import md5
 
@@ -13,7 +13,8 @@ class User(BaseModel, Base):
     """Representation of a user """
     if models.storage_t == 'db':
         __tablename__ = 'users'
-        email = Column(String(128), nullable=False)
+        __table_args__ = (Index('ix_users_created_at', 'created_at', 'id'),)
+        email = Column(String(128), nullable=False, index=True)
         password = Column(String(128), nullable=False)
         first_name = Column(String(128), nullable=True)
         last_name = Column(String(128), nullable=True)
@@ -24,11 +25,25 @@ class User(BaseModel, Base):
         password = ""
         first_name = ""
         last_name = ""
+    transformed = ("password",)
 
     def __init__(self, *args, **kwargs):
         """initializes user"""
         super().__init__(*args, **kwargs)
 
+    if models.storage_t != 'db':
+        @property
+        def places(self):
+            """getter for list of place instances of the user"""
+            from models.place import Place
+            return models.storage.referrers(Place, "user_id", self.id)
+
+        @property
+        def reviews(self):
+            """getter for list of review instances of the user"""
+            from models.review import Review
+            return models.storage.referrers(Review, "user_id", self.id)
+
     """
     Security is VERY important and storing passwords in plain text is
     a horible idea.  This update incorporates md5, which isn't perfect
@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+"""
+Contains the FileStorageTestCase class
+"""
+
+import models
+from models.engine import file_storage, serializers
+import os
+import unittest
+FileStorage = file_storage.FileStorage
+
+
+class FileStorageTestCase(unittest.TestCase):
+    """Base for the tests that run FileStorage against a scratch file, the
+    database storage is left as it is"""
+    journal = False
+    lazy = False
+
+    def setUp(self):
+        """Point FileStorage at an empty file"""
+        if models.storage_t == 'db':
+            self.storage = models.storage
+            return
+        self.saved = (FileStorage._FileStorage__objects,
+                      FileStorage._FileStorage__file_path,
+                      FileStorage._FileStorage__serializer,
+                      FileStorage._FileStorage__fallback,
+                      FileStorage._FileStorage__journal,
+                      FileStorage._FileStorage__journal_max,
+                      FileStorage._FileStorage__lazy,
+                      FileStorage._FileStorage__pending,
+                      FileStorage._FileStorage__stamp,
+                      FileStorage._FileStorage__applied)
+        self.path = "test_file_storage_{}.json".format(type(self).__name__)
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__file_path = self.path
+        FileStorage._FileStorage__serializer = serializers.serializers["json"]
+        FileStorage._FileStorage__fallback = False
+        FileStorage._FileStorage__journal = self.journal
+        FileStorage._FileStorage__lazy = self.lazy
+        FileStorage._FileStorage__pending = {}
+        self.storage = FileStorage()
+
+    def tearDown(self):
+        """Restore FileStorage and remove the test files"""
+        if models.storage_t == 'db':
+            return
+        (FileStorage._FileStorage__objects,
+         FileStorage._FileStorage__file_path,
+         FileStorage._FileStorage__serializer,
+         FileStorage._FileStorage__fallback,
+         FileStorage._FileStorage__journal,
+         FileStorage._FileStorage__journal_max,
+         FileStorage._FileStorage__lazy,
+         FileStorage._FileStorage__pending,
+         FileStorage._FileStorage__stamp,
+         FileStorage._FileStorage__applied) = self.saved
+        for name in [self.path, self.path + ".log", self.path + ".lock"]:
+            if os.path.exists(name):
+                os.remove(name)
+
+    def restart(self):
+        """Drop the objects in memory and reload them from disk"""
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__pending = {}
+        self.storage.reload()
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""
+Contains the TestAppConcurrency classes
+"""
+
+from api.v1.app import app
+import models
+from models.state import State
+import pep8
+from tests.storage_case import FileStorageTestCase
+import threading
+import unittest
+
+
+class TestAppDocs(unittest.TestCase):
+    """Tests to check the style of the API tests"""
+    def test_pep8_conformance_test_app(self):
+        """Test tests/test_api/test_app.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_app.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestAppConcurrency(FileStorageTestCase):
+    """Hammer the API from several threads sharing one FileStorage"""
+    threads = 8
+    rounds = 25
+
+    def setUp(self):
+        """Point FileStorage at a scratch file holding a few states"""
+        super().setUp()
+        for i in range(20):
+            State(name="State {}".format(i)).save()
+        self.errors = []
+
+    def check(self, response, status):
+        """Record a response whose status is not the expected one"""
+        if response.status_code != status:
+            self.errors.append((response.request.method,
+                                response.request.path,
+                                response.status_code))
+        return response
+
+    def client(self, n, kept):
+        """Create, update, read and delete states, keeping every other one"""
+        client = app.test_client()
+        try:
+            for i in range(self.rounds):
+                state = self.check(client.post(
+                    "/api/v1/states", json={"name": "{}-{}".format(n, i)}),
+                    201).get_json()
+                self.check(client.put("/api/v1/states/" + state["id"],
+                                      json={"name": "renamed"}), 200)
+                states = self.check(client.get("/api/v1/states"), 200)
+                if not isinstance(states.get_json(), list):
+                    self.errors.append(("GET", "/api/v1/states", "not a list"))
+                self.check(client.get("/api/v1/stats"), 200)
+                self.check(client.get("/api/v1/states/" + state["id"]), 200)
+                if i % 2:
+                    self.check(client.delete(
+                        "/api/v1/states/" + state["id"]), 200)
+                else:
+                    kept.append(state["id"])
+        except Exception as e:
+            self.errors.append(e)
+
+    def test_concurrent_requests(self):
+        """Test that concurrent requests neither fail nor lose writes"""
+        kept = []
+        workers = [threading.Thread(target=self.client, args=(n, kept))
+                   for n in range(self.threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(self.errors, [])
+        storage = models.storage
+        self.assertEqual(storage.count(State), 20 + len(kept))
+        for state_id in kept:
+            self.assertEqual(storage.get(State, state_id).name, "renamed")
+        expected = set(storage.all(State))
+        self.restart()
+        self.assertEqual(set(storage.all(State)), expected)
+
+
+class TestAppConcurrencyJournal(TestAppConcurrency):
+    """Hammer the API with FileStorage appending to its journal"""
+    journal = True
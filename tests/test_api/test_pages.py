@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+"""
+Contains the TestPages classes
+"""
+
+from api.v1.app import app
+from api.v1.views import pages
+import models
+from models.state import State
+import pep8
+from tests.storage_case import FileStorageTestCase
+import unittest
+
+
+class TestPagesDocs(unittest.TestCase):
+    """Tests to check the documentation and style of pages.py"""
+    def test_pep8_conformance_pages(self):
+        """Test api/v1/views/pages.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/pages.py',
+                                    'tests/test_api/test_pages.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pages_docstrings(self):
+        """Test for the docstrings of pages.py"""
+        self.assertTrue(len(pages.__doc__) >= 1)
+        self.assertTrue(len(pages.paginate.__doc__) >= 1)
+
+
+class TestPages(FileStorageTestCase):
+    """Test listing states a page at a time"""
+    def setUp(self):
+        """Store a few states"""
+        super().setUp()
+        self.states = [State(name=str(n)) for n in range(7)]
+        for state in self.states:
+            models.storage.new(state)
+        models.storage.save()
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Delete the states"""
+        for state in self.states:
+            models.storage.delete(state)
+        models.storage.save()
+        super().tearDown()
+
+    def test_unpaged(self):
+        """Test that a request without limit lists every state"""
+        response = self.client.get("/api/v1/states")
+        self.assertEqual(response.status_code, 200)
+        ids = [state["id"] for state in response.get_json()]
+        for state in self.states:
+            self.assertIn(state.id, ids)
+        self.assertNotIn("Link", response.headers)
+
+    def test_pages(self):
+        """Test that following the next links lists every state once"""
+        url, ids = "/api/v1/states?limit=3", []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            page = response.get_json()
+            self.assertLessEqual(len(page), 3)
+            ids.extend(state["id"] for state in page)
+            link = response.headers.get("Link")
+            url = link and link[1:link.index(">")]
+        self.assertEqual(len(ids), len(set(ids)))
+        mine = [id for id in ids if id in [state.id for state in self.states]]
+        states = sorted(self.states, key=lambda state: (state.created_at,
+                                                        state.id))
+        self.assertEqual(mine, [state.id for state in states])
+
+    def test_invalid(self):
+        """Test that a bad limit or cursor is rejected"""
+        for query in ["limit=0", "limit=x", "limit=2&after=nope"]:
+            with self.subTest(query=query):
+                response = self.client.get("/api/v1/states?" + query)
+                self.assertEqual(response.status_code, 400)
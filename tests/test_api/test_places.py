@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesSearch classes
+"""
+
+from api.v1.app import app
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+from tests.storage_case import FileStorageTestCase
+import unittest
+
+
+class TestPlacesDocs(unittest.TestCase):
+    """Tests to check the style of the places tests"""
+    def test_pep8_conformance_places(self):
+        """Test api/v1/views/places.py and its tests conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/places.py',
+                                    'tests/test_api/test_places.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestPlacesSearch(FileStorageTestCase):
+    """Test the /places_search endpoint"""
+    def setUp(self):
+        """Store two states with a city each and a place in every city"""
+        super().setUp()
+        self.states = [State(name="A"), State(name="B")]
+        self.cities = [City(name="a", state_id=self.states[0].id),
+                       City(name="b", state_id=self.states[1].id),
+                       City(name="c", state_id=self.states[1].id)]
+        user = User(email="a@b.c", password="pwd")
+        self.places = [Place(name=city.name, city_id=city.id,
+                             user_id=user.id) for city in self.cities]
+        self.wifi = Amenity(name="Wifi")
+        for obj in self.states + self.cities + self.places:
+            models.storage.new(obj)
+        models.storage.new(user)
+        models.storage.new(self.wifi)
+        models.storage.link(self.places[1], self.wifi)
+        models.storage.save()
+        self.client = app.test_client()
+
+    def search(self, body):
+        """Returns the sorted names of the places found for body"""
+        response = self.client.post("/api/v1/places_search", json=body)
+        self.assertEqual(response.status_code, 200)
+        return sorted(place["name"] for place in response.get_json())
+
+    def test_search(self):
+        """Test searching places by state, city and amenity"""
+        self.assertEqual(self.search({}), ["a", "b", "c"])
+        self.assertEqual(self.search({"states": [self.states[1].id]}),
+                         ["b", "c"])
+        self.assertEqual(self.search({"states": [self.states[1].id],
+                                      "cities": [self.cities[0].id]}),
+                         ["a", "b", "c"])
+        self.assertEqual(self.search({"cities": [self.cities[0].id]}),
+                         ["a"])
+        self.assertEqual(self.search({"amenities": [self.wifi.id]}), ["b"])
+        self.assertEqual(self.search({"cities": [self.cities[0].id],
+                                      "amenities": [self.wifi.id]}), [])
+
+    def test_not_json(self):
+        """Test that a body that is not a JSON object is rejected"""
+        response = self.client.post("/api/v1/places_search", data="[",
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_not_list(self):
+        """Test that states, cities or amenities not listing ids are
+        rejected"""
+        for key in ["states", "cities", "amenities"]:
+            for value in [self.states[1].id, {"id": self.states[1].id},
+                          [1]]:
+                with self.subTest(key=key, value=value):
+                    response = self.client.post("/api/v1/places_search",
+                                                json={key: value})
+                    self.assertEqual(response.status_code, 400)
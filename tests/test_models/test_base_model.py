@@ -138,6 +138,25 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    def test_to_dict_cached(self):
+        """Test that to_dict reuses its dictionary until an attribute is
+        set"""
+        inst = BaseModel()
+        with mock.patch.object(models.base_model, "format_time",
+                               wraps=models.base_model.format_time) as fmt:
+            first = inst.to_dict()
+            first["name"] = "changed"
+            second = inst.to_dict()
+            self.assertEqual(fmt.call_count, 2)
+        self.assertIsNot(first, second)
+        self.assertNotIn("name", second)
+        inst.name = "Holberton"
+        self.assertEqual(inst.to_dict()["name"], "Holberton")
+        inst.updated_at = datetime(2017, 9, 28, 21, 3, 54, 52298)
+        self.assertEqual(inst.to_dict()["updated_at"],
+                         "2017-09-28T21:03:54.052298")
+        self.assertNotIn("_BaseModel__dict", inst.__dict__)
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
@@ -158,3 +177,55 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(old_created_at, new_created_at)
         self.assertTrue(mock_storage.new.called)
         self.assertTrue(mock_storage.save.called)
+
+    @unittest.skipIf(models.storage_t == 'db', "BaseModel is not mapped")
+    @mock.patch('models.storage')
+    def test_save_unchanged(self, mock_storage):
+        """Test that save does nothing when no attribute changed"""
+        inst = BaseModel()
+        self.assertIn("id", inst.changed())
+        inst.mark_saved()
+        self.assertEqual(inst.changed(), set())
+        updated_at = inst.updated_at
+        inst.id = inst.id
+        inst.save()
+        self.assertEqual(inst.updated_at, updated_at)
+        self.assertFalse(mock_storage.save.called)
+        inst.name = "Holberton"
+        self.assertEqual(inst.changed(), {"name"})
+        self.assertNotIn("changed", inst.to_dict())
+        inst.save()
+        self.assertNotEqual(inst.updated_at, updated_at)
+        self.assertTrue(mock_storage.save.called)
+
+
+class TestTimeCodec(unittest.TestCase):
+    """Test that the timestamp codec matches strptime and strftime"""
+    t_format = "%Y-%m-%dT%H:%M:%S.%f"
+
+    def test_format_time(self):
+        """Test format_time against strftime"""
+        from datetime import timezone
+        for value in [datetime(2017, 9, 28, 21, 3, 54, 52298),
+                      datetime(2017, 9, 28), datetime(999, 1, 2, 3, 4, 5, 6),
+                      datetime(2020, 2, 29, 23, 59, 59, 999999,
+                               timezone.utc),
+                      datetime.utcnow()]:
+            with self.subTest(value=value):
+                self.assertEqual(models.base_model.format_time(value),
+                                 value.strftime(self.t_format))
+
+    def test_parse_time(self):
+        """Test parse_time against strptime"""
+        for string in ["2017-09-28T21:03:54.052298",
+                       "2017-09-28T21:03:54.000000",
+                       "2017-09-28T21:03:54.5", "0999-01-02T03:04:05.000006"]:
+            with self.subTest(string=string):
+                self.assertEqual(models.base_model.parse_time(string),
+                                 datetime.strptime(string, self.t_format))
+        for string in ["2017-09-28T21:03:54", "2017-09-28 21:03:54.052298",
+                       "2017-09-28T21:03:54.052298+00:00",
+                       "2017-09-28T21:03:54.05229Z", "yesterday"]:
+            with self.subTest(string=string):
+                with self.assertRaises(ValueError):
+                    models.base_model.parse_time(string)
@@ -15,9 +15,13 @@ from models.review import Review
 from models.state import State
 from models.user import User
 import json
+import multiprocessing
 import os
 import pep8
+from tests.storage_case import FileStorageTestCase
+import threading
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -95,6 +99,8 @@ class TestFileStorage(unittest.TestCase):
         FileStorage._FileStorage__objects = save
 
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    @unittest.skipIf(os.getenv("HBNB_FILE_FORMAT", "json") != "json",
+                     "not writing file.json")
     def test_save(self):
         """Test that save properly saves objects to file.json"""
         storage = FileStorage()
@@ -113,3 +119,630 @@ class TestFileStorage(unittest.TestCase):
         with open("file.json", "r") as f:
             js = f.read()
         self.assertEqual(json.loads(string), json.loads(js))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_by_class(self):
+        """Test that all(cls) only returns objects of that class"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        state = State()
+        city = City()
+        storage.new(state)
+        storage.new(city)
+        self.assertEqual(storage.all(State), {"State." + state.id: state})
+        self.assertEqual(storage.all("City"), {"City." + city.id: city})
+        self.assertEqual(storage.all("Place"), {})
+        self.assertEqual(storage.count(State), 1)
+        self.assertEqual(storage.count(), 2)
+        storage.delete(state)
+        self.assertEqual(storage.all(State), {})
+        self.assertEqual(storage.count("State"), 0)
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get(self):
+        """Test that get returns the object by class or class name"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        user = User()
+        storage.new(user)
+        self.assertIs(storage.get(User, user.id), user)
+        self.assertIs(storage.get("User", user.id), user)
+        self.assertIsNone(storage.get("State", user.id))
+        self.assertIsNone(storage.get("User", "missing"))
+        FileStorage._FileStorage__objects = save
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_counts(self):
+        """Test that counts tallies every class at once"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        storage.new(State())
+        storage.new(State())
+        storage.new(Amenity())
+        counts = storage.counts()
+        self.assertEqual(counts["State"], 2)
+        self.assertEqual(counts["Amenity"], 1)
+        self.assertEqual(counts["Review"], 0)
+        FileStorage._FileStorage__objects = save
+
+
+def work(n, state_id, rounds):
+    """Rename a state and create then delete others from another process"""
+    storage = FileStorage()
+    state = storage.get(State, state_id)
+    for i in range(rounds):
+        state.name = "{}-{}".format(n, i)
+        state.save()
+        other = State(name="{}-{}".format(n, i))
+        other.save()
+        if i % 2:
+            storage.delete(other)
+            storage.save()
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageJournal(FileStorageTestCase):
+    """Test the journal mode of the FileStorage class"""
+    journal = True
+
+    def test_save_appends(self):
+        """Test that save appends the changes to the journal only"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        self.assertFalse(os.path.exists(self.path))
+        city = City(name="San Francisco")
+        self.storage.new(city)
+        self.storage.delete(state)
+        self.storage.save()
+        with open(self.path + ".log") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r[0] for r in records], ["put", "del", "put"])
+        self.restart()
+        self.assertEqual(list(self.storage.all()), ["City." + city.id])
+        self.assertEqual(self.storage.get(City, city.id).name,
+                         "San Francisco")
+
+    def test_save_patches(self):
+        """Test that saving a stored object appends what changed only"""
+        state = State(name="Kansas")
+        self.storage.new(state)
+        self.storage.save()
+        self.restart()
+        state = self.storage.get(State, state.id)
+        state.name = "Kansas"
+        self.storage.new(state)
+        self.storage.save()
+        state.name = "Texas"
+        state.save()
+        with open(self.path + ".log") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r[0] for r in records], ["put", "patch"])
+        self.assertEqual(sorted(records[1][2]), ["name", "updated_at"])
+        self.restart()
+        self.assertEqual(self.storage.get(State, state.id).to_dict(),
+                         state.to_dict())
+
+    def test_compaction(self):
+        """Test that a journal past the threshold is folded into the file"""
+        FileStorage._FileStorage__journal_max = 0
+        state = State(name="Nevada")
+        self.storage.new(state)
+        self.storage.save()
+        self.assertFalse(os.path.exists(self.path + ".log"))
+        with open(self.path) as f:
+            self.assertIn("State." + state.id, json.load(f))
+        self.restart()
+        self.assertEqual(self.storage.get(State, state.id).name, "Nevada")
+
+    def test_truncated_record(self):
+        """Test that a record torn by a crash is ignored and dropped"""
+        for cut in [1, 10, 40]:
+            with self.subTest(cut=cut):
+                first = State(name="Oregon")
+                self.storage.new(first)
+                self.storage.save()
+                second = State(name="Utah")
+                self.storage.new(second)
+                self.storage.save()
+                size = os.path.getsize(self.path + ".log")
+                with open(self.path + ".log", "r+b") as f:
+                    f.truncate(size - cut)
+                self.restart()
+                self.assertIsNotNone(self.storage.get(State, first.id))
+                self.assertIsNone(self.storage.get(State, second.id))
+                third = State(name="Idaho")
+                self.storage.new(third)
+                self.storage.save()
+                self.restart()
+                self.assertIsNotNone(self.storage.get(State, first.id))
+                self.assertIsNotNone(self.storage.get(State, third.id))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageTransaction(FileStorageTestCase):
+    """Test the transactions of the FileStorage class"""
+    def setUp(self):
+        """Save a state and a city"""
+        super().setUp()
+        self.state = State(name="Vermont")
+        self.city = City(name="Burlington", state_id=self.state.id)
+        self.storage.new(self.state)
+        self.storage.new(self.city)
+        self.storage.save()
+
+    def files(self):
+        """returns the identity of the JSON file and its journal"""
+        return [os.path.exists(name) and os.stat(name).st_mtime_ns
+                for name in [self.path, self.path + ".log"]]
+
+    def test_saves_once(self):
+        """Test that saving in a transaction writes the file at exit"""
+        before = self.files()
+        with self.storage.transaction():
+            states = [State(name=str(i)) for i in range(3)]
+            for state in states:
+                state.save()
+            with self.storage.batch():
+                self.state.name = "Maine"
+                self.state.save()
+            self.assertTrue(self.storage.in_transaction())
+            self.assertEqual(self.files(), before)
+        self.assertFalse(self.storage.in_transaction())
+        self.assertNotEqual(self.files(), before)
+        self.restart()
+        self.assertEqual(self.storage.count(State), 4)
+        self.assertEqual(self.storage.get(State, self.state.id).name,
+                         "Maine")
+
+    def test_rollback(self):
+        """Test that an exception puts the changed objects back"""
+        before = self.files()
+        state = State(name="Maine")
+        with self.assertRaises(KeyError):
+            with self.storage.transaction():
+                state.save()
+                self.state.name = "Maine"
+                self.state.save()
+                self.city.delete()
+                with self.storage.transaction():
+                    raise KeyError
+        self.assertFalse(self.storage.in_transaction())
+        self.assertEqual(self.files(), before)
+        self.assertIsNone(self.storage.get(State, state.id))
+        self.assertEqual(self.storage.get(State, self.state.id).name,
+                         "Vermont")
+        self.assertEqual(self.storage.get(State, self.state.id).cities,
+                         [self.storage.get(City, self.city.id)])
+        self.storage.save()
+        self.restart()
+        self.assertEqual(self.storage.count(), 2)
+        self.assertEqual(self.storage.get(State, self.state.id).name,
+                         "Vermont")
+
+    def test_rollback_after_other_save(self):
+        """Test that an exception puts the changed objects back when another
+        thread saved them during the block"""
+        state = State(name="Maine")
+        with self.assertRaises(KeyError):
+            with self.storage.transaction():
+                state.save()
+                self.state.name = "Maine"
+                self.state.save()
+                other = State(name="Ohio")
+                thread = threading.Thread(target=other.save)
+                thread.start()
+                thread.join()
+                raise KeyError
+        self.assertIsNone(self.storage.get(State, state.id))
+        self.assertEqual(self.state.name, "Vermont")
+        self.restart()
+        self.assertIsNone(self.storage.get(State, state.id))
+        self.assertEqual(self.storage.get(State, self.state.id).name,
+                         "Vermont")
+        self.assertEqual(self.storage.get(State, other.id).name, "Ohio")
+
+
+class TestFileStorageTransactionJournal(TestFileStorageTransaction):
+    """Test the transactions of the FileStorage class in journal mode"""
+    journal = True
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageClose(FileStorageTestCase):
+    """Test that FileStorage.close only reloads what changed on disk"""
+    def test_close_unchanged(self):
+        """Test that close does not read an unchanged file"""
+        state = State(name="Texas")
+        self.storage.new(state)
+        self.storage.save()
+        with mock.patch.object(file_storage.serializers, "load") as load:
+            self.storage.close()
+            self.assertFalse(load.called)
+        self.assertIs(self.storage.get(State, state.id), state)
+
+    def test_close_merges_file(self):
+        """Test that close rebuilds only the objects changed on disk"""
+        kept = State(name="Ohio")
+        changed = State(name="Iowa")
+        for state in [kept, changed]:
+            self.storage.new(state)
+        self.storage.save()
+        with open(self.path) as f:
+            jo = json.load(f)
+        key = "State." + changed.id
+        jo[key]["name"] = "Maine"
+        jo[key]["updated_at"] = "2030-01-01T00:00:00.000000"
+        with open(self.path, "w") as f:
+            json.dump(jo, f)
+        self.storage.close()
+        self.assertIs(self.storage.get(State, kept.id), kept)
+        self.assertEqual(self.storage.get(State, changed.id).name, "Maine")
+
+    def test_close_replays_journal(self):
+        """Test that close applies records appended to the journal"""
+        FileStorage._FileStorage__journal = True
+        state = State(name="Kansas")
+        self.storage.new(state)
+        self.storage.save()
+        fields = state.to_dict()
+        fields["name"] = "Kentucky"
+        with open(self.path + ".log", "a") as f:
+            f.write(json.dumps(["put", "State." + state.id, fields]) + "\n")
+        self.storage.close()
+        self.assertEqual(self.storage.get(State, state.id).name, "Kentucky")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageLazy(FileStorageTestCase):
+    """Test the lazy mode of the FileStorage class"""
+    lazy = True
+
+    def setUp(self):
+        """Save a few objects and reload them lazily"""
+        super().setUp()
+        self.states = [State(name="State{}".format(i)) for i in range(3)]
+        self.cities = [City(name="City{}".format(i)) for i in range(2)]
+        for obj in self.states + self.cities:
+            self.storage.new(obj)
+        self.storage.save()
+        self.restart()
+
+    def test_reload_builds_nothing(self):
+        """Test that reload keeps the records without building objects"""
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+        self.assertEqual(self.storage.count(), 5)
+        self.assertEqual(self.storage.count(State), 3)
+        self.assertEqual(self.storage.counts()["City"], 2)
+
+    def test_get_builds_one(self):
+        """Test that get only builds the object it returns"""
+        state = self.storage.get(State, self.states[0].id)
+        self.assertEqual(state.name, "State0")
+        self.assertEqual(list(FileStorage._FileStorage__objects),
+                         ["State." + state.id])
+
+    def test_all_builds_class(self):
+        """Test that all(cls) only builds the objects of that class"""
+        self.assertEqual(len(self.storage.all(City)), 2)
+        self.assertEqual(len(FileStorage._FileStorage__objects), 2)
+        self.assertEqual(len(self.storage.all()), 5)
+
+    def test_built_read_shared(self):
+        """Test that looking up built objects takes the lock as a reader
+        while other records are still pending"""
+        state = self.storage.get(State, self.states[0].id)
+        self.storage.all(City)
+        lock = FileStorage._FileStorage__lock
+        with mock.patch.object(lock, "writing",
+                               wraps=lock.writing) as writing:
+            for _ in range(10):
+                self.assertIs(self.storage.get(State, state.id), state)
+            self.assertEqual(len(self.storage.all(City)), 2)
+            self.assertEqual(self.storage.referrers(City, "state_id",
+                                                    state.id), [])
+            writing.assert_not_called()
+            self.storage.get(State, self.states[1].id)
+            writing.assert_called_once_with()
+
+    def test_new_replaces_pending(self):
+        """Test that new drops the references of the record it replaces"""
+        city = City(name="a", state_id=self.states[0].id)
+        self.storage.new(city)
+        self.storage.save()
+        self.restart()
+        self.storage.counts()
+        City(id=city.id, name="a", state_id=self.states[1].id).save()
+        self.assertEqual(self.storage.get(State, self.states[0].id).cities,
+                         [])
+        self.assertEqual([city.id for city in self.storage.get(
+            State, self.states[1].id).cities], [city.id])
+
+    def test_iter_all_builds_batches(self):
+        """Test that iter_all builds the objects a batch at a time"""
+        objs = self.storage.iter_all(State, batch_size=2)
+        next(objs)
+        self.assertEqual(len(FileStorage._FileStorage__objects), 2)
+        self.assertEqual(len(list(objs)), 2)
+        self.assertEqual(len(FileStorage._FileStorage__objects), 3)
+        self.assertEqual(sorted(obj.id for obj in self.storage.iter_all()),
+                         sorted(obj.id for obj in self.states + self.cities))
+
+    def test_save_keeps_pending(self):
+        """Test that save writes the records that were never built"""
+        self.storage.delete(self.storage.get(State, self.states[0].id))
+        self.storage.save()
+        self.restart()
+        self.assertEqual(self.storage.count(), 4)
+        self.assertIsNone(self.storage.get(State, self.states[0].id))
+
+
+class ReferencesTestCase(FileStorageTestCase):
+    """Base for the tests on objects referencing each other"""
+    def setUp(self):
+        """Store two states, a city in each and a place with a review"""
+        super().setUp()
+        self.states = [State(name="A"), State(name="B")]
+        self.cities = [City(name="a", state_id=self.states[0].id),
+                       City(name="b", state_id=self.states[1].id)]
+        self.user = User(email="a@b.c", password="pwd")
+        self.place = Place(name="P", city_id=self.cities[0].id,
+                           user_id=self.user.id)
+        self.review = Review(text="ok", place_id=self.place.id,
+                             user_id=self.user.id)
+        for obj in self.states + self.cities + [self.user, self.place,
+                                                self.review]:
+            self.storage.new(obj)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageReferences(ReferencesTestCase):
+    """Test the reference index behind the relationship getters"""
+    def test_getters(self):
+        """Test that the getters return the objects referencing them"""
+        self.assertEqual(self.states[0].cities, [self.cities[0]])
+        self.assertEqual(self.states[1].cities, [self.cities[1]])
+        self.assertEqual(self.cities[0].places, [self.place])
+        self.assertEqual(self.cities[1].places, [])
+        self.assertEqual(self.place.reviews, [self.review])
+        self.assertEqual(self.user.places, [self.place])
+        self.assertEqual(self.user.reviews, [self.review])
+
+    def test_attribute_change(self):
+        """Test that changing a reference moves the object"""
+        self.cities[1].state_id = self.states[0].id
+        self.assertEqual(self.states[0].cities, self.cities)
+        self.assertEqual(self.states[1].cities, [])
+
+    def test_delete(self):
+        """Test that a deleted object is no longer returned"""
+        self.storage.delete(self.cities[0])
+        self.assertEqual(self.states[0].cities, [])
+
+    def test_reload(self):
+        """Test that the index is rebuilt on reload, lazily or not"""
+        self.storage.save()
+        for lazy in [False, True]:
+            with self.subTest(lazy=lazy):
+                FileStorage._FileStorage__lazy = lazy
+                self.restart()
+                state = self.storage.get(State, self.states[0].id)
+                self.assertEqual([city.id for city in state.cities],
+                                 [self.cities[0].id])
+
+    def test_link(self):
+        """Test linking and unlinking amenities and places"""
+        wifi = Amenity(name="Wifi")
+        other = Place(name="Q", city_id=self.cities[1].id)
+        for obj in [wifi, other]:
+            self.storage.new(obj)
+        self.storage.link(self.place, wifi)
+        self.storage.link(self.place, wifi)
+        self.storage.link(other, wifi)
+        self.assertEqual(self.place.amenities, [wifi])
+        self.assertEqual(wifi.place_amenities, [self.place, other])
+        self.assertEqual(Place().amenity_ids, [])
+        self.storage.unlink(self.place, wifi)
+        self.assertEqual(self.place.amenities, [])
+        self.assertEqual(wifi.place_amenities, [other])
+        self.storage.save()
+        self.restart()
+        wifi = self.storage.get(Amenity, wifi.id)
+        self.assertEqual([place.id for place in wifi.place_amenities],
+                         [other.id])
+
+    def test_iter_all_order(self):
+        """Test that iter_all yields every object in the order all() holds
+        them"""
+        objs = self.states + self.cities + [self.user, self.place,
+                                            self.review]
+        self.assertEqual(list(self.storage.iter_all(batch_size=3)), objs)
+        self.assertEqual(list(self.storage.iter_all()),
+                         list(self.storage.all().values()))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+@unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(),
+                     "needs fork")
+class TestFileStorageProcesses(FileStorageTestCase):
+    """Test FileStorage shared between several processes"""
+    workers = 4
+    rounds = 20
+
+    def test_no_lost_updates(self):
+        """Test that the changes saved by each process all reach the file"""
+        states = [State(name="{}".format(n)) for n in range(self.workers)]
+        for state in states:
+            self.storage.new(state)
+        self.storage.save()
+        context = multiprocessing.get_context("fork")
+        processes = [context.Process(target=work,
+                                     args=(n, state.id, self.rounds))
+                     for n, state in enumerate(states)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual([process.exitcode for process in processes],
+                         [0] * self.workers)
+        self.restart()
+        self.assertEqual(self.storage.count(State),
+                         self.workers * (1 + self.rounds // 2))
+        for n, state in enumerate(states):
+            self.assertEqual(self.storage.get(State, state.id).name,
+                             "{}-{}".format(n, self.rounds - 1))
+
+    def test_close_sees_deletes(self):
+        """Test that close() drops the objects another process deleted"""
+        state = State(name="Texas")
+        self.storage.new(state)
+        self.storage.save()
+        context = multiprocessing.get_context("fork")
+        process = context.Process(target=self.delete_in_process,
+                                  args=(state,))
+        process.start()
+        process.join()
+        self.storage.close()
+        self.assertIsNone(self.storage.get(State, state.id))
+
+    def delete_in_process(self, state):
+        """Delete state and save"""
+        self.storage.delete(state)
+        self.storage.save()
+
+    def test_fields_merged(self):
+        """Test that processes saving different attributes of an object
+        keep each other's changes"""
+        place = Place(name="P", description="D")
+        self.storage.new(place)
+        self.storage.save()
+        context = multiprocessing.get_context("fork")
+        saved = context.Event()
+        process = context.Process(target=self.describe_in_process,
+                                  args=(place, saved))
+        process.start()
+        place.name = "from parent"
+        place.save()
+        saved.set()
+        process.join()
+        self.assertEqual(process.exitcode, 0)
+        self.restart()
+        place = self.storage.get(Place, place.id)
+        self.assertEqual(place.name, "from parent")
+        self.assertEqual(place.description, "from child")
+
+    def describe_in_process(self, place, saved):
+        """Change the description of place once saved is set and save"""
+        saved.wait()
+        place.description = "from child"
+        place.save()
+
+    def test_close_sees_unlink(self):
+        """Test that close() and save() keep a change another process saved
+        without BaseModel.save() moving updated_at"""
+        place = Place(name="P")
+        wifi = Amenity(name="Wifi")
+        for obj in [place, wifi]:
+            self.storage.new(obj)
+        self.storage.link(place, wifi)
+        self.storage.save()
+        context = multiprocessing.get_context("fork")
+        process = context.Process(target=self.unlink_in_process,
+                                  args=(place, wifi))
+        process.start()
+        process.join()
+        self.assertEqual(process.exitcode, 0)
+        self.storage.close()
+        self.assertEqual(self.storage.get(Place, place.id).amenity_ids, [])
+        self.storage.new(State(name="Texas"))
+        self.storage.save()
+        self.restart()
+        self.assertEqual(self.storage.get(Place, place.id).amenity_ids, [])
+
+    def unlink_in_process(self, place, wifi):
+        """Unlink wifi from place and save"""
+        self.storage.unlink(place, wifi)
+        self.storage.save()
+
+
+class TestFileStorageProcessesJournal(TestFileStorageProcesses):
+    """Test FileStorage shared between processes appending to a journal"""
+    journal = True
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageQuery(ReferencesTestCase):
+    """Test the queries of the FileStorage class"""
+
+    def test_indexed(self):
+        """Test that conditions on references do not scan the objects"""
+        with mock.patch.object(FileStorage, "all") as scan:
+            query = self.storage.query(City).filter(
+                state_id=self.states[0].id)
+            self.assertEqual(query.all(), [self.cities[0]])
+            query = self.storage.query("City").filter(
+                state_id__in=[state.id for state in self.states],
+                name__ne="b")
+            self.assertEqual(query.all(), [self.cities[0]])
+            query = self.storage.query(City).filter(id=self.cities[1].id)
+            self.assertEqual(query.first(), self.cities[1])
+            self.assertIsNone(query.filter(name="a").first())
+        scan.assert_not_called()
+
+    def test_scan(self):
+        """Test conditions on other fields"""
+        query = self.storage.query(State)
+        self.assertEqual(query.count(), 2)
+        self.assertEqual(query.filter(name="B").all(), [self.states[1]])
+        self.assertEqual(query.filter(name__gte="A", name__lt="B").all(),
+                         [self.states[0]])
+        self.assertEqual(query.filter(name__in=["C"]).all(), [])
+        with self.assertRaises(ValueError):
+            query.filter(name__like="A")
+
+    def test_list_fields(self):
+        """Test that a list of ids meets a condition on one of them"""
+        wifi = Amenity(name="Wifi")
+        self.storage.new(wifi)
+        self.storage.link(self.place, wifi)
+        query = self.storage.query(Place)
+        self.assertEqual(query.filter(amenity_ids=wifi.id).all(),
+                         [self.place])
+        self.assertEqual(query.filter(amenity_ids="other").all(), [])
+
+    def test_page(self):
+        """Test listing objects a page at a time from the sorted index"""
+        states = [State(name=str(n)) for n in range(5)]
+        for state in states:
+            self.storage.new(state)
+        for order_by in ["id", "created_at", "name"]:
+            with self.subTest(order_by=order_by):
+                expected = sorted(self.states + states, key=lambda obj: (
+                    getattr(obj, order_by), obj.id))
+                objs, after = [], None
+                with mock.patch.object(FileStorage, "all",
+                                       side_effect=self.storage.all) as scan:
+                    while True:
+                        page, after = self.storage.page(State, 2, after,
+                                                        order_by)
+                        objs.extend(page)
+                        if after is None:
+                            break
+                self.assertEqual(objs, expected)
+                self.assertEqual(scan.called, order_by == "name")
+        # the index follows the objects added and removed
+        self.storage.delete(states[0])
+        state = State(name="new")
+        self.storage.new(state)
+        objs = self.storage.page(State, 10, order_by="created_at")[0]
+        self.assertEqual(objs[-1], state)
+        self.assertNotIn(states[0], objs)
+        with self.assertRaises(ValueError):
+            self.storage.page(State, 2, "nope")
+        after = self.storage.page(State, 2, order_by="name")[1]
+        with self.assertRaises(ValueError):
+            self.storage.page(State, 2, after, "created_at")
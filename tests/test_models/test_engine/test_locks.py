@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+"""
+Contains the TestRWLock classes
+"""
+
+from models.engine import locks
+import pep8
+import threading
+import unittest
+RWLock = locks.RWLock
+
+
+class TestLocksDocs(unittest.TestCase):
+    """Tests to check the documentation and style of locks.py"""
+    def test_pep8_conformance_locks(self):
+        """Test that models/engine/locks.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/locks.py',
+                                    'tests/test_models/test_engine/\
+test_locks.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_locks_docstrings(self):
+        """Test for the docstrings of locks.py"""
+        self.assertTrue(len(locks.__doc__) >= 1)
+        self.assertTrue(len(RWLock.__doc__) >= 1)
+        for name in ["reading", "writing"]:
+            self.assertTrue(len(getattr(RWLock, name).__doc__) >= 1)
+
+
+class TestRWLock(unittest.TestCase):
+    """Test the RWLock class"""
+    def test_readers_share(self):
+        """Test that a reader does not wait for another reader"""
+        lock = RWLock()
+        inside = threading.Event()
+        with lock.reading():
+            def read():
+                with lock.reading():
+                    inside.set()
+            thread = threading.Thread(target=read)
+            thread.start()
+            self.assertTrue(inside.wait(5))
+            thread.join()
+
+    def test_writer_excludes(self):
+        """Test that readers and writers wait for the writer"""
+        lock = RWLock()
+        done = []
+
+        def read():
+            with lock.reading():
+                done.append("read")
+
+        def write():
+            with lock.writing():
+                done.append("write")
+        with lock.writing():
+            threads = [threading.Thread(target=read),
+                       threading.Thread(target=write)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(0.1)
+            done.append("writer")
+        for thread in threads:
+            thread.join()
+        self.assertEqual(done[0], "writer")
+        self.assertEqual(sorted(done[1:]), ["read", "write"])
+
+    def test_reentrant(self):
+        """Test that the writer may write again and read"""
+        lock = RWLock()
+        with lock.writing():
+            with lock.writing():
+                with lock.reading():
+                    pass
+        with lock.reading():
+            with lock.reading():
+                pass
+
+    def test_upgrade(self):
+        """Test that a reader cannot become the writer"""
+        lock = RWLock()
+        with lock.reading():
+            with self.assertRaises(RuntimeError):
+                with lock.writing():
+                    pass
+        with lock.writing():
+            pass
@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""
+Contains the TestTimedQueuePoolDocs and TestTimedQueuePool classes
+"""
+
+import inspect
+import models
+from models.engine import pool
+import os
+import pep8
+from sqlalchemy.exc import TimeoutError
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+TimedQueuePool = pool.TimedQueuePool
+
+
+class TestTimedQueuePoolDocs(unittest.TestCase):
+    """Tests to check the documentation and style of pool.py"""
+    def test_pep8_conformance_pool(self):
+        """Test that models/engine/pool.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/pool.py',
+                                    'tests/test_models/test_engine/\
+test_pool.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pool_docstrings(self):
+        """Test for the docstrings of pool.py"""
+        self.assertTrue(len(pool.__doc__) >= 1)
+        self.assertTrue(len(TimedQueuePool.__doc__) >= 1)
+        for name in ["__init__", "_do_get", "stats"]:
+            self.assertTrue(len(getattr(TimedQueuePool, name).__doc__) >= 1)
+
+
+class TestTimedQueuePool(unittest.TestCase):
+    """Test the TimedQueuePool class"""
+    def setUp(self):
+        """Make a pool of a single in-memory database connection"""
+        self.pool = TimedQueuePool(
+            lambda: sqlite3.connect(":memory:", check_same_thread=False),
+            pool_size=1, max_overflow=0, timeout=0.05)
+
+    def tearDown(self):
+        """Close the pool's connections"""
+        self.pool.dispose()
+
+    def test_stats(self):
+        """Test that checkouts are counted"""
+        for i in range(3):
+            self.pool.connect().close()
+        stats = self.pool.stats()
+        self.assertEqual(stats["size"], 1)
+        self.assertEqual(stats["checkouts"], 3)
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertEqual(stats["peak_checked_out"], 1)
+        self.assertEqual(stats["saturated"], 0)
+
+    def test_saturated(self):
+        """Test that waiting for a busy pool is recorded"""
+        connection = self.pool.connect()
+        with self.assertRaises(TimeoutError):
+            self.pool.connect()
+        released = threading.Timer(0.01, connection.close)
+        released.start()
+        self.pool._timeout = 5
+        self.pool.connect().close()
+        released.join()
+        stats = self.pool.stats()
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["saturated"], 1)
+        self.assertGreater(stats["wait_max_ms"], 0)
+        self.assertGreaterEqual(stats["wait_total_ms"], stats["wait_max_ms"])
+
+    def test_recreate(self):
+        """Test that a recreated pool is timed too"""
+        self.assertIsInstance(self.pool.recreate(), TimedQueuePool)
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestPoolOptions(unittest.TestCase):
+    """Test the pool settings read from the environment"""
+    def test_options(self):
+        """Test that HBNB_POOL_* configure the pool of the engine"""
+        from models.engine.sqlite_storage import SQLiteStorage
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {"HBNB_SQLITE_PATH": os.path.join(tmp, "pool.db"),
+                   "HBNB_ENV": "", "HBNB_POOL_SIZE": "7",
+                   "HBNB_POOL_MAX_OVERFLOW": "3", "HBNB_POOL_TIMEOUT": "2",
+                   "HBNB_POOL_RECYCLE": "60", "HBNB_POOL_PRE_PING": "0"}
+            with mock.patch.dict(os.environ, env):
+                storage = SQLiteStorage()
+            engine = storage._DBStorage__engine
+            self.assertEqual(engine.pool.size(), 7)
+            self.assertEqual(engine.pool._max_overflow, 3)
+            self.assertEqual(engine.pool._timeout, 2)
+            self.assertEqual(engine.pool._recycle, 60)
+            self.assertFalse(engine.pool._pre_ping)
+            self.assertEqual(storage.pool_stats()["size"], 7)
+            engine.dispose()
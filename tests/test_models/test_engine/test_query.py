@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""
+Contains the TestQueryDocs and TestQuery classes
+"""
+
+import inspect
+from models.engine import query
+from models.state import State
+import pep8
+import unittest
+
+
+class TestQueryDocs(unittest.TestCase):
+    """Tests to check the documentation and style of query.py"""
+    def test_pep8_conformance_query(self):
+        """Test that models/engine/query.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/query.py',
+                                    'tests/test_models/test_engine/\
+test_query.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_query_docstrings(self):
+        """Test for the docstrings of query.py"""
+        self.assertTrue(len(query.__doc__) >= 1)
+        for name, func in inspect.getmembers(query, inspect.isfunction) + \
+                inspect.getmembers(query.Query, inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} needs a docstring".format(name))
+
+
+class TestQuery(unittest.TestCase):
+    """Test the parsing and matching of conditions"""
+    def test_parse(self):
+        """Test that keywords are split into field and operator"""
+        self.assertEqual(query.parse({"name": "A", "id__in": ("a", "b"),
+                                      "number_rooms__gte": 2}),
+                         [("name", "eq", "A"), ("id", "in", ["a", "b"]),
+                          ("number_rooms", "gte", 2)])
+        with self.assertRaises(ValueError):
+            query.parse({"name__like": "A"})
+
+    def test_matches(self):
+        """Test that objects are matched against every condition"""
+        state = State(name="Texas")
+        self.assertTrue(query.matches(state, []))
+        self.assertTrue(query.matches(state, query.parse(
+            {"name": "Texas", "name__in": ["Texas"], "name__gt": "A"})))
+        self.assertFalse(query.matches(state, query.parse(
+            {"name": "Texas", "name__lt": "A"})))
+        self.assertFalse(query.matches(state, query.parse(
+            {"missing__gte": 1})))
+        self.assertTrue(query.matches(state, query.parse({"missing": None})))
+
+    def test_filter(self):
+        """Test that filter() returns a new narrower query"""
+        everything = query.Query(State)
+        narrow = everything.filter(name="A")
+        self.assertEqual(everything.conditions, [])
+        self.assertEqual(narrow.conditions, [("name", "eq", "A")])
+        self.assertIs(narrow.cls, State)
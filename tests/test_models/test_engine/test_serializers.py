@@ -0,0 +1,234 @@
+#!/usr/bin/python3
+"""
+Contains the TestSerializersDocs and TestSerializers classes
+"""
+
+from datetime import datetime
+import inspect
+import io
+import json
+import models
+from models.engine import file_storage, serializers
+from models.place import Place
+from models.state import State
+import os
+import pep8
+from tests.storage_case import FileStorageTestCase
+import unittest
+FileStorage = file_storage.FileStorage
+
+
+class TestSerializersDocs(unittest.TestCase):
+    """Tests to check the documentation and style of serializers.py"""
+    def test_pep8_conformance_serializers(self):
+        """Test that models/engine/serializers.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/serializers.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_serializers(self):
+        """Test tests/test_models/test_serializers.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_serializers.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_serializers_module_docstring(self):
+        """Test for the serializers.py module docstring"""
+        self.assertIsNot(serializers.__doc__, None,
+                         "serializers.py needs a docstring")
+        self.assertTrue(len(serializers.__doc__) >= 1,
+                        "serializers.py needs a docstring")
+
+    def test_serializers_func_docstrings(self):
+        """Test for the presence of docstrings in serializers.py"""
+        funcs = inspect.getmembers(serializers, inspect.isfunction)
+        for cls in [serializers.JSONSerializer,
+                    serializers.BinarySerializer]:
+            funcs += inspect.getmembers(cls, inspect.isfunction)
+        for func in funcs:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestIterload(unittest.TestCase):
+    """Test the streaming JSON reader and writer"""
+    def test_iterload_chunks(self):
+        """Test that iterload decodes the same object for any chunk size"""
+        jo = {"State.1": {"name": "A \\\"quoted\\\" {name}", "n": [1, 2]},
+              "City.2": {"name": "B", "f": 1.5, "none": None},
+              "Place.3": {}}
+        text = json.dumps(jo, indent=2)
+        for size in [1, 3, 7, 64, 1 << 16]:
+            with self.subTest(size=size):
+                f = io.StringIO(text)
+                self.assertEqual(dict(serializers.iterload(f, size)), jo)
+
+    def test_iterload_empty(self):
+        """Test that iterload yields nothing for an empty object"""
+        self.assertEqual(list(serializers.iterload(io.StringIO(" {} "))),
+                         [])
+
+    def test_iterload_truncated(self):
+        """Test that iterload raises ValueError on a truncated file"""
+        text = json.dumps({"State.1": {"name": "A"}, "State.2": {}})
+        for end in [0, 1, 10, len(text) - 1]:
+            with self.subTest(end=end):
+                with self.assertRaises(ValueError):
+                    list(serializers.iterload(io.StringIO(text[:end]), 4))
+
+    def test_iterdump(self):
+        """Test that iterdump writes what json.dump writes"""
+        jo = {"State.{}".format(i): {"name": str(i)} for i in range(5)}
+        for size in [1, 2, 10]:
+            with self.subTest(size=size):
+                f = io.StringIO()
+                serializers.iterdump(jo.items(), f, size)
+                self.assertEqual(f.getvalue(), json.dumps(jo))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestBinarySerializer(unittest.TestCase):
+    """Test the binary format"""
+    def setUp(self):
+        """Make a few objects"""
+        self.objs = [State(name="California"),
+                     Place(name="Loft", number_rooms=2, latitude=37.7,
+                           amenity_ids=["a", "b"], description=None)]
+        self.binary = serializers.BinarySerializer(size=1)
+
+    def dump(self, serializer, records):
+        """Returns the bytes serializer writes for records"""
+        f = io.BytesIO()
+        serializer.dump(records, f)
+        return f.getvalue()
+
+    def test_round_trip(self):
+        """Test that objects read back with the same attributes"""
+        data = self.dump(self.binary, [
+            (obj.__class__.__name__ + "." + obj.id, self.binary.encode(obj))
+            for obj in self.objs])
+        self.assertTrue(data.startswith(b"HBNB"))
+        records = dict(serializers.load(io.BufferedReader(io.BytesIO(data))))
+        for obj in self.objs:
+            with self.subTest(obj=obj):
+                fields = records[obj.__class__.__name__ + "." + obj.id]
+                self.assertEqual(fields.pop("__class__"),
+                                 obj.__class__.__name__)
+                self.assertEqual(fields, obj.__dict__)
+
+    def test_string_timestamps(self):
+        """Test that fields in the to_dict() format are accepted"""
+        state = self.objs[0]
+        data = self.dump(self.binary, [("State." + state.id,
+                                        state.to_dict())])
+        fields = dict(self.binary.load(io.BytesIO(data)))["State." + state.id]
+        self.assertEqual(fields["created_at"], state.created_at)
+        self.assertIs(type(fields["updated_at"]), datetime)
+
+    def test_truncated(self):
+        """Test that a truncated file raises ValueError"""
+        data = self.dump(self.binary, [
+            (obj.__class__.__name__ + "." + obj.id, self.binary.encode(obj))
+            for obj in self.objs])
+        for end in [0, 3, 9, 20, len(data) - 1]:
+            with self.subTest(end=end):
+                with self.assertRaises(ValueError):
+                    list(self.binary.load(io.BytesIO(data[:end])))
+
+    def test_marshal_version(self):
+        """Test that a file written by an older marshal is read and one
+        written by a newer marshal is rejected"""
+        data = self.dump(self.binary, [
+            (obj.__class__.__name__ + "." + obj.id, self.binary.encode(obj))
+            for obj in self.objs])
+        header = self.binary.header
+        magic, version, marshal_version = header.unpack_from(data)
+        older = header.pack(magic, version, marshal_version - 1)
+        records = list(self.binary.load(io.BytesIO(
+            older + data[header.size:])))
+        self.assertEqual(len(records), len(self.objs))
+        newer = header.pack(magic, version, marshal_version + 1)
+        with self.assertRaises(ValueError):
+            list(self.binary.load(io.BytesIO(newer + data[header.size:])))
+
+    def test_convert(self):
+        """Test that convert goes from JSON to binary and back"""
+        records = {obj.__class__.__name__ + "." + obj.id: obj.to_dict()
+                   for obj in self.objs}
+        names = ["test_serializers.json", "test_serializers.hbnb",
+                 "test_serializers_back.json"]
+        try:
+            with open(names[0], "w") as f:
+                json.dump(records, f)
+            serializers.convert(names[0], names[1], "binary")
+            serializers.convert(names[1], names[2], "json")
+            with open(names[1], "rb") as f:
+                self.assertEqual(f.read(4), b"HBNB")
+            with open(names[2]) as f:
+                self.assertEqual(json.load(f), records)
+        finally:
+            for name in names:
+                if os.path.exists(name):
+                    os.remove(name)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageBinary(FileStorageTestCase):
+    """Test FileStorage writing its file in the binary format"""
+    def setUp(self):
+        """Point FileStorage at an empty binary file"""
+        super().setUp()
+        self.json = self.path
+        self.path = os.path.splitext(self.path)[0] + ".hbnb"
+        FileStorage._FileStorage__file_path = self.path
+        FileStorage._FileStorage__serializer = \
+            serializers.serializers["binary"]
+
+    def tearDown(self):
+        """Restore FileStorage and remove the JSON files too"""
+        super().tearDown()
+        for name in [self.json, self.json + ".log"]:
+            if os.path.exists(name):
+                os.remove(name)
+
+    def test_save_reload(self):
+        """Test that objects saved in binary reload unchanged"""
+        state = State(name="Arizona")
+        self.storage.new(state)
+        self.storage.save()
+        self.restart()
+        loaded = self.storage.get(State, state.id)
+        self.assertIsNot(loaded, state)
+        self.assertEqual(loaded.to_dict(), state.to_dict())
+
+    def test_converts_json(self):
+        """Test that the JSON file and its journal are read while there is
+        no binary file, then saved in binary"""
+        states = [State(name="Utah"), State(name="Idaho")]
+        with open(self.json, "w") as f:
+            json.dump({"State." + state.id: state.to_dict()
+                       for state in states[:1]}, f)
+        with open(self.json + ".log", "w") as f:
+            f.write(json.dumps(["put", "State." + states[1].id,
+                                states[1].to_dict()]) + "\n")
+        self.restart()
+        self.assertEqual(self.storage.count(State), 2)
+        self.storage.new(State(name="Nevada"))
+        self.storage.save()
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(4), b"HBNB")
+        with open(self.json) as f:
+            self.assertEqual(len(json.load(f)), 1)
+        self.restart()
+        self.assertEqual(self.storage.count(State), 3)
+        self.assertEqual(self.storage.get(State, states[1].id).name, "Idaho")
+
+
+class TestFileStorageBinaryJournal(TestFileStorageBinary):
+    """Test FileStorage journaling on top of a binary file"""
+    journal = True
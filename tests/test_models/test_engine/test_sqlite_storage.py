@@ -0,0 +1,505 @@
+#!/usr/bin/python3
+"""
+Contains the TestSQLiteStorageDocs and TestSQLiteStorage classes
+"""
+
+import importlib
+import inspect
+import io
+import models
+import os
+from models.engine import sqlite_storage
+from models.amenity import Amenity
+from models.base_model import Base
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import re
+from sqlalchemy import event
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+SQLiteStorage = sqlite_storage.SQLiteStorage
+
+
+class TestSQLiteStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SQLiteStorage class"""
+    def test_pep8_conformance_sqlite_storage(self):
+        """Test that models/engine/sqlite_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/sqlite_storage.py',
+                                    'tests/test_models/test_engine/\
+test_sqlite_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_sqlite_storage_docstrings(self):
+        """Test for the docstrings of sqlite_storage.py"""
+        self.assertTrue(len(sqlite_storage.__doc__) >= 1)
+        self.assertTrue(len(SQLiteStorage.__doc__) >= 1)
+        for name, func in inspect.getmembers(SQLiteStorage,
+                                             inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} method needs a docstring".format(name))
+
+
+@unittest.skipIf(not isinstance(models.storage, SQLiteStorage),
+                 "not testing sqlite storage")
+class TestSQLiteStorage(unittest.TestCase):
+    """Test the SQLiteStorage class"""
+    def test_pragmas(self):
+        """Test that connections are set up with the pragmas"""
+        engine = models.storage._DBStorage__engine
+        with engine.connect() as connection:
+            pragma = connection.exec_driver_sql
+            self.assertEqual(pragma("PRAGMA journal_mode").scalar(), "wal")
+            self.assertEqual(pragma("PRAGMA foreign_keys").scalar(), 1)
+            self.assertEqual(pragma("PRAGMA synchronous").scalar(), 1)
+
+    def test_save_get_count(self):
+        """Test that saved objects can be found and counted"""
+        count = models.storage.count(State)
+        state = State(name="Oregon")
+        models.storage.new(state)
+        models.storage.save()
+        city = City(name="Portland", state_id=state.id)
+        models.storage.new(city)
+        models.storage.save()
+        self.assertIs(models.storage.get(State, state.id), state)
+        self.assertEqual(models.storage.count(State), count + 1)
+        self.assertEqual(state.cities, [city])
+
+    def test_foreign_keys(self):
+        """Test that a city cannot refer to a missing state"""
+        models.storage.new(City(name="Nowhere", state_id="missing"))
+        with self.assertRaises(Exception):
+            models.storage.save()
+        models.storage._DBStorage__session.rollback()
+
+    def test_threads_isolated(self):
+        """Test that other threads only see changes once they are saved"""
+        state = State(name="Nevada")
+        models.storage.new(state)
+        seen = []
+
+        def look():
+            seen.append(models.storage.get(State, state.id))
+            models.storage.close()
+        thread = threading.Thread(target=look)
+        thread.start()
+        thread.join()
+        models.storage.save()
+        thread = threading.Thread(target=look)
+        thread.start()
+        thread.join()
+        self.assertIsNone(seen[0])
+        self.assertEqual(seen[1].id, state.id)
+
+    def test_query(self):
+        """Test that queries are run in the database"""
+        state = State(name="Utah")
+        models.storage.new(state)
+        models.storage.save()
+        cities = [City(name=name, state_id=state.id)
+                  for name in ["Ogden", "Provo", "Moab"]]
+        for city in cities:
+            models.storage.new(city)
+        models.storage.save()
+        query = models.storage.query(City).filter(state_id=state.id)
+        self.assertEqual(query.count(), 3)
+        self.assertEqual(query.filter(name__in=["Provo", "Moab"],
+                                      name__gt="Oz").all(), [cities[1]])
+        self.assertEqual(models.storage.query("City").filter(
+            state_id=state.id, name__ne="Moab").count(), 2)
+        self.assertIsNone(query.filter(name="Reno").first())
+
+    def test_page(self):
+        """Test listing objects a page at a time"""
+        state = State(name="Idaho")
+        models.storage.new(state)
+        models.storage.save()
+        cities = [City(name=name, state_id=state.id)
+                  for name in ["Boise", "Nampa", "Boise", "Eagle"]]
+        for city in cities:
+            models.storage.new(city)
+        models.storage.save()
+        query = models.storage.query(City).filter(state_id=state.id)
+        for order_by in ["id", "name", "created_at"]:
+            with self.subTest(order_by=order_by):
+                objs, after = [], None
+                while True:
+                    page, after = query.order_by(order_by).page(3, after)
+                    objs.extend(page)
+                    if after is None:
+                        break
+                self.assertEqual(objs, sorted(cities, key=lambda obj: (
+                    getattr(obj, order_by), obj.id)))
+        self.assertEqual(len(models.storage.page(City, 2)[0]), 2)
+
+    def test_iter_all(self):
+        """Test streaming the objects of a class"""
+        from console import HBNBCommand
+        states = [State(name="T{}".format(i)) for i in range(5)]
+        for state in states:
+            models.storage.new(state)
+        models.storage.save()
+        ids = [obj.id for obj in models.storage.iter_all(State, 2)]
+        self.assertEqual(len(ids), models.storage.count(State))
+        self.assertLessEqual({state.id for state in states}, set(ids))
+        self.assertEqual(list(models.storage.iter_all("BaseModel")), [])
+        with mock.patch("sys.stdout", new=io.StringIO()) as out:
+            HBNBCommand().onecmd("all State")
+        for state in states:
+            self.assertIn(str(state), out.getvalue())
+
+    def test_transaction(self):
+        """Test that a transaction commits once, or not at all"""
+        engine = models.storage._DBStorage__engine
+        commits = []
+
+        def commit(conn):
+            commits.append(conn)
+        event.listen(engine, "commit", commit)
+        try:
+            with models.storage.transaction():
+                states = [State(name=str(i)) for i in range(3)]
+                for state in states:
+                    state.save()
+                with models.storage.batch():
+                    states[0].name = "Utah"
+                    states[0].save()
+                self.assertEqual(commits, [])
+            self.assertEqual(len(commits), 1)
+            ids = [state.id for state in states]
+            with self.assertRaises(KeyError):
+                with models.storage.transaction():
+                    state = State(name="Ohio")
+                    state.save()
+                    id = state.id
+                    states[1].delete()
+                    raise KeyError
+            self.assertEqual(len(commits), 1)
+        finally:
+            event.remove(engine, "commit", commit)
+        models.storage.close()
+        self.assertEqual(models.storage.get(State, ids[0]).name, "Utah")
+        self.assertIsNotNone(models.storage.get(State, ids[1]))
+        self.assertIsNone(models.storage.get(State, id))
+
+    def test_save_changed(self):
+        """Test that saving updates the changed columns only, or nothing"""
+        user = User(email="c@d.e", password="pwd", first_name="Ann")
+        user.save()
+        models.storage.close()
+        user = models.storage.get(User, user.id)
+        updated_at = user.updated_at
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+        engine = models.storage._DBStorage__engine
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            user.first_name = "Ann"
+            user.save()
+            self.assertEqual(statements, [])
+            self.assertEqual(user.updated_at, updated_at)
+            user.last_name = "Lee"
+            self.assertEqual(user.changed(), {"last_name"})
+            user.save()
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        update = [s for s in statements if s.startswith("UPDATE")]
+        self.assertEqual(len(update), 1)
+        self.assertIn("last_name", update[0])
+        self.assertNotIn("email", update[0])
+        self.assertEqual(user.changed(), set())
+
+    def test_save_after_autoflush(self):
+        """Test that a query flushing a change does not make save skip it"""
+        state = State(name="A")
+        state.save()
+        models.storage.close()
+        state = models.storage.get(State, state.id)
+        state.name = "Changed"
+        models.storage.query(City).filter(state_id=state.id).all()
+        self.assertEqual(state.changed(), {"name"})
+        state.save()
+        self.assertEqual(state.changed(), set())
+        models.storage.close()
+        self.assertEqual(models.storage.get(State, state.id).name, "Changed")
+
+    def test_to_dict_expired(self):
+        """Test that to_dict follows the attributes SQLAlchemy reloads"""
+        state = State(name="Kansas")
+        models.storage.new(state)
+        models.storage.save()
+        self.assertEqual(state.to_dict()["name"], "Kansas")
+        engine = models.storage._DBStorage__engine
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                "UPDATE states SET name = 'Texas' WHERE id = ?", (state.id,))
+        models.storage._DBStorage__session.refresh(state)
+        self.assertEqual(state.to_dict()["name"], "Texas")
+
+    def add_states(self, n):
+        """Save n states with two cities each"""
+        for i in range(n):
+            state = State(name="S{}".format(i))
+            models.storage.new(state)
+            models.storage.save()
+            for name in ["a", "b"]:
+                models.storage.new(City(name=name, state_id=state.id))
+            models.storage.save()
+
+    def test_load(self):
+        """Test that relationships listed in load come with the objects"""
+        self.add_states(3)
+        models.storage.close()
+        states = models.storage.all(State, load=["cities"]).values()
+        before = models.storage.statements()
+        self.assertTrue(all(len(state.cities) == 2 for state in states
+                            if state.name.startswith("S")))
+        self.assertEqual(models.storage.statements(), before)
+        models.storage.close()
+        self.assertEqual(models.storage.statements(), 0)
+        states = models.storage.all(State, load={"cities": "joined"})
+        self.assertLessEqual(models.storage.statements(), 2)
+        self.assertEqual(models.storage.query(City).count(),
+                         sum(len(state.cities) for state in states.values()))
+        self.assertLessEqual(models.storage.statements(), 3)
+        models.storage.close()
+        states = models.storage.all(State, load=["cities.places"])
+        for state in states.values():
+            for city in state.cities:
+                city.places
+        self.assertLessEqual(models.storage.statements(), 4)
+        models.storage.close()
+
+    def test_cities_by_states(self):
+        """Test that the states page runs as many statements for any number
+        of states"""
+        module = importlib.import_module("web_flask.8-cities_by_states")
+        counts = []
+        for n in [2, 6]:
+            self.add_states(n)
+            with module.app.test_request_context():
+                models.storage.close()
+                module.cities_by_states()
+                counts.append(models.storage.statements())
+        self.assertEqual(counts[0], counts[1])
+
+    def test_statement_header(self):
+        """Test that the API reports the statements each request ran"""
+        from api.v1.app import app
+        user = User(email="x@y.z", password="pwd")
+        state = State(name="Maine")
+        models.storage.new(user)
+        models.storage.new(state)
+        models.storage.save()
+        city = City(name="Bangor", state_id=state.id)
+        models.storage.new(city)
+        models.storage.save()
+        place = Place(name="Lodge", city_id=city.id, user_id=user.id)
+        models.storage.new(place)
+        models.storage.save()
+        for name in ["Wifi", "Pool", "Sauna"]:
+            amenity = Amenity(name=name)
+            models.storage.new(amenity)
+            models.storage.link(place, amenity)
+        models.storage.save()
+        models.storage.close()
+        response = app.test_client().get(
+            "/api/v1/places/{}/amenities".format(place.id))
+        self.assertEqual(len(response.get_json()), 3)
+        self.assertLessEqual(int(response.headers["X-Statement-Count"]), 3)
+
+    def test_pool_status(self):
+        """Test that the API reports the usage of the connection pool"""
+        from api.v1.app import app
+        client = app.test_client()
+        client.get("/api/v1/stats")
+        stats = client.get("/api/v1/status/pool").get_json()
+        self.assertGreater(stats["checkouts"], 0)
+        self.assertEqual(stats["size"], models.storage.pool_stats()["size"])
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestReplicas(unittest.TestCase):
+    """Test routing reads to replicas, two SQLite files standing in for
+    the primary and its replica"""
+    def setUp(self):
+        """Make a primary holding two states and a replica holding one"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.primary = os.path.join(self.tmp.name, "primary.db")
+        replicas = [os.path.join(self.tmp.name, name)
+                    for name in ["replica.db", "empty.db"]]
+        env = {"HBNB_SQLITE_PATH": self.primary, "HBNB_ENV": "",
+               "HBNB_SQLITE_REPLICA_PATHS": replicas[0]}
+        with mock.patch.dict(os.environ, env):
+            self.storage = SQLiteStorage()
+        self.storage.reload()
+        self.old = State(name="Old")
+        self.storage.new(self.old)
+        self.storage.save()
+        self.storage.close()
+        self.replicate(replicas[0])
+        self.new = State(name="New")
+        self.storage.new(self.new)
+        self.storage.save()
+        self.storage.close()
+
+    def tearDown(self):
+        """Close the engines and remove the files"""
+        self.storage.close()
+        for engine in [self.storage._DBStorage__engine] + \
+                self.storage._DBStorage__replicas:
+            engine.dispose()
+        self.tmp.cleanup()
+
+    def replicate(self, path):
+        """Copy the primary database to path"""
+        primary = sqlite3.connect(self.primary)
+        replica = sqlite3.connect(path)
+        primary.backup(replica)
+        primary.close()
+        replica.close()
+
+    def names(self):
+        """Returns the sorted names of the states storage reads"""
+        return sorted(state.name for state in
+                      self.storage.all(State).values())
+
+    def test_reads_from_replica(self):
+        """Test that reads go to the replica"""
+        self.assertEqual(self.names(), ["Old"])
+        self.assertEqual(self.storage.count(State), 1)
+        self.assertIsNone(self.storage.get(State, self.new.id))
+        self.assertEqual(self.storage.query(State).count(), 1)
+
+    def test_read_your_writes(self):
+        """Test that reads after a write go to the primary until close()"""
+        self.assertEqual(self.names(), ["Old"])
+        state = State(name="Newest")
+        self.storage.new(state)
+        self.assertEqual(self.names(), ["New", "Newest", "Old"])
+        self.assertEqual(self.storage.count(State), 3)
+        self.storage.save()
+        self.assertEqual(self.storage.count(State), 3)
+        self.storage.close()
+        self.assertEqual(self.names(), ["Old"])
+
+    def test_write_replica_object(self):
+        """Test that an object read from the replica saves to the primary"""
+        state = self.storage.get(State, self.old.id)
+        state.name = "Renamed"
+        self.storage.new(state)
+        self.storage.save()
+        self.storage.close()
+        primary = sqlite3.connect(self.primary)
+        self.assertEqual(primary.execute(
+            "SELECT name FROM states WHERE id = ?",
+            (self.old.id,)).fetchone(), ("Renamed",))
+        primary.close()
+
+    def test_round_robin(self):
+        """Test that sessions take turns on the replicas"""
+        self.storage.close()
+        for engine in [self.storage._DBStorage__engine] + \
+                self.storage._DBStorage__replicas:
+            engine.dispose()
+        path = os.path.join(self.tmp.name, "second.db")
+        self.replicate(path)
+        env = {"HBNB_SQLITE_PATH": self.primary, "HBNB_ENV": "",
+               "HBNB_SQLITE_REPLICA_PATHS": ",".join(
+                   [os.path.join(self.tmp.name, "replica.db"), path])}
+        with mock.patch.dict(os.environ, env):
+            self.storage = SQLiteStorage()
+        self.storage.reload()
+        counts = []
+        for i in range(4):
+            counts.append(self.storage.count(State))
+            self.storage.close()
+        self.assertEqual(counts, [1, 2, 1, 2])
+
+
+@unittest.skipIf(not isinstance(models.storage, SQLiteStorage),
+                 "not testing sqlite storage")
+class TestIndexes(unittest.TestCase):
+    """Test the indexes the models declare"""
+    def test_nested_routes(self):
+        """Test that the nested routes look rows up through indexes"""
+        from api.v1.app import app
+        user = User(email="i@j.k", password="pwd")
+        state = State(name="Iowa")
+        for obj in [user, state]:
+            models.storage.new(obj)
+        models.storage.save()
+        city = City(name="Ames", state_id=state.id)
+        models.storage.new(city)
+        models.storage.save()
+        place = Place(name="Barn", city_id=city.id, user_id=user.id)
+        models.storage.new(place)
+        models.storage.save()
+        models.storage.close()
+        engine = models.storage._DBStorage__engine
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, *args):
+            if statement.startswith("SELECT"):
+                statements.append((statement, parameters))
+        event.listen(engine, "before_cursor_execute", capture)
+        client = app.test_client()
+        try:
+            for url in ["/api/v1/states/{}/cities".format(state.id),
+                        "/api/v1/cities/{}/places".format(city.id),
+                        "/api/v1/places/{}/reviews".format(place.id),
+                        "/api/v1/places/{}/amenities".format(place.id),
+                        "/api/v1/users/{}".format(user.id)]:
+                for args in ["", "?limit=1", "?limit=1&after="]:
+                    if args.endswith("="):
+                        link = response.headers.get("Link")
+                        if not link:
+                            continue
+                        url = link[1:link.index(">")]
+                        args = ""
+                    response = client.get(url + args)
+                    self.assertEqual(response.status_code, 200)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        self.assertGreater(len(statements), 10)
+        with engine.connect() as connection:
+            for statement, parameters in statements:
+                plan = connection.exec_driver_sql(
+                    "EXPLAIN QUERY PLAN " + statement, parameters).all()
+                for row in plan:
+                    with self.subTest(statement=statement, plan=row[-1]):
+                        self.assertFalse(row[-1].startswith("SCAN"))
+                        self.assertNotIn("TEMP B-TREE", row[-1])
+
+    def test_migrate(self):
+        """Test that migrate() adds the indexes a database lacks"""
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {"HBNB_SQLITE_PATH": os.path.join(tmp, "old.db"),
+                   "HBNB_ENV": ""}
+            with mock.patch.dict(os.environ, env):
+                storage = SQLiteStorage()
+            storage.reload()
+            engine = storage._DBStorage__engine
+            indexes = sorted(index.name for table in
+                             Base.metadata.sorted_tables
+                             for index in table.indexes)
+            with engine.begin() as connection:
+                for name in indexes[:3]:
+                    connection.exec_driver_sql("DROP INDEX " + name)
+            self.assertEqual(storage.migrate(), indexes[:3])
+            self.assertEqual(storage.migrate(), [])
+            engine.dispose()
+        with open("migrate_mysql_indexes.sql") as f:
+            script = f.read()
+        self.assertEqual(sorted(re.findall(r"CREATE INDEX (\w+)", script)),
+                         indexes)
@@ -198,3 +198,16 @@ class TestPlace(unittest.TestCase):
         place = Place()
         string = "[Place] ({}) {}".format(place.id, place.__dict__)
         self.assertEqual(string, str(place))
+
+    def test_kwargs_coerced(self):
+        """test that numeric attributes given as strings are converted"""
+        place = Place(number_rooms="3", max_guest=4.0, latitude="37.77",
+                      longitude=-122, price_by_night="cheap", pets="no")
+        self.assertEqual(place.number_rooms, 3)
+        self.assertIs(type(place.max_guest), int)
+        self.assertEqual(place.latitude, 37.77)
+        self.assertIs(type(place.longitude), float)
+        self.assertEqual(place.price_by_night, "cheap")
+        self.assertEqual(place.pets, "no")
+        copy = Place(**place.to_dict())
+        self.assertEqual(copy.to_dict(), place.to_dict())
@@ -130,3 +130,12 @@ class TestUser(unittest.TestCase):
         user = User()
         string = "[User] ({}) {}".format(user.id, user.__dict__)
         self.assertEqual(string, str(user))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_kwargs_password(self):
+        """test that the constructor hashes the password it is given"""
+        user = User(email="a@b.c", password="pwd")
+        self.assertEqual(user.password, User(password="pwd").password)
+        self.assertNotEqual(user.password, "pwd")
+        self.assertEqual(user.changed(), {"email", "password", "id",
+                                          "created_at", "updated_at"})